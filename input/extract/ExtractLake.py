@@ -59,12 +59,7 @@ class ExtractLake(ExtractStrategy):
     def extract(self):
         """Extracts data from SWOT shapefiles and stores in data dictionaries."""
         
-        for shpfile in self.shapefiles:
-            if self.creds:
-                df = self.get_fsspec(shpfile)
-            else:
-                dbf = f"{shpfile.split('/')[-1].split('.')[0]}.dbf"
-                df = self.get_df(shpfile, dbf)
+        for shpfile, df in self.extract_parallel(self.shapefiles):
             extracted = self.extract_lake(df)
             if extracted:
                 c = Path(shpfile).name.split('_')[5]
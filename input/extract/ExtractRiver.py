@@ -12,12 +12,13 @@ calculate_d_x_a(wse, width)
     Calculate and return the change in area.
 create_node_dict(nx, nt)
     Initialize an empty node dict of numpy array values
+extract_block(df, names, dtype, fill)
+    Return dataframe columns as a single numpy array of dtype
 """
 
 # Standard imports
 import json
 from pathlib import Path
-import time
 
 # Third-party imports
 import numpy as np
@@ -43,12 +44,26 @@ class ExtractRiver(ExtractStrategy):
         dictionary of reach and node dictionaries
     node_ids: list
         list of integer node identifiers
-    NODE_VARS: list
-        list of node variables to extract from SWOT shapefiles
+    NODE_FLOAT_VARS: tuple
+        node variables extracted as float64
+    NODE_INT_VARS: tuple
+        node variables extracted as int64
+    NODE_STR_VARS: tuple
+        node variables extracted as strings
+    NODE_VARS: tuple
+        tuple of node variables to extract from SWOT shapefiles
+    reach_blocks: dict
+        dictionary of extracted reach data blocks organized by dtype group
     reach_id: int
         integer reach identifer
-    REACH_VARS: list
-        list of reach variables to extract from SWOT shapefiles
+    REACH_FLOAT_VARS: tuple
+        reach variables extracted as float64
+    REACH_INT_VARS: tuple
+        reach variables extracted as int64
+    REACH_STR_VARS: tuple
+        reach variables extracted as strings
+    REACH_VARS: tuple
+        tuple of reach variables to extract from SWOT shapefiles
 
     Methods
     -------
@@ -60,13 +75,23 @@ class ExtractRiver(ExtractStrategy):
         extract node level data from shapefile found at node_file path.
     extract_reach(reach_file, time)
         extract reach level data from shapefile found at reach_file path.
+    stack_reach()
+        stack extracted reach data blocks into the reach data dictionary.
     """
     
     # Constants
     FLOAT_FILL = -999999999999
-    REACH_VARS = ["slope", "slope_u", "slope2", "slope2_u", "width", "width_u", "wse", "wse_u", "d_x_area", "d_x_area_u", "reach_q", "dark_frac", "ice_clim_f", "ice_dyn_f", "partial_f", "n_good_nod", "obs_frac_n", "xovr_cal_q", "time", "time_str"]
+    INT_FILL = -999
+    REACH_FLOAT_VARS = ("slope", "slope_u", "slope2", "slope2_u", "width", "width_u", "wse", "wse_u", "d_x_area", "d_x_area_u", "dark_frac", "obs_frac_n", "time")
+    REACH_INT_VARS = ("reach_q", "ice_clim_f", "ice_dyn_f", "partial_f", "n_good_nod", "xovr_cal_q")
+    REACH_STR_VARS = ("time_str",)
+    REACH_VARS = REACH_FLOAT_VARS + REACH_INT_VARS + REACH_STR_VARS
     # NODE_VARS = ["width", "width_u", "wse", "wse_u", "node_q", "dark_frac", "ice_clim_f", "ice_dyn_f", "partial_f", "n_good_pix", "xovr_cal_q", "time", "time_str"]
-    NODE_VARS = ["width", "width_u", "wse", "wse_u", "node_q", "dark_frac", "ice_clim_f", "ice_dyn_f", "node_q_b","n_good_pix", "xovr_cal_q", "time", "time_str"]
+    NODE_FLOAT_VARS = ("width", "width_u", "wse", "wse_u", "dark_frac", "time")
+    NODE_INT_VARS = ("node_q", "ice_clim_f", "ice_dyn_f", "node_q_b", "n_good_pix", "xovr_cal_q")
+    NODE_STR_VARS = ("time_str",)
+    NODE_VARS = NODE_FLOAT_VARS + NODE_INT_VARS + NODE_STR_VARS
+
     def __init__(self, swot_id, shapefiles, cycle_pass, output_dir, creds, node_ids):
         """
         Parameters
@@ -89,6 +114,7 @@ class ExtractRiver(ExtractStrategy):
             "reach": { key: np.array([]) for key in self.REACH_VARS },
             "node": None
         }
+        self.reach_blocks = { "float": [], "int": [], "str": [] }
 
     def get_creds(self):
         """Return AWS S3 credentials to access S3 shapefiles."""
@@ -143,27 +169,16 @@ class ExtractRiver(ExtractStrategy):
         # Extract reach data
         rch_shpfile = [ shpfile for shpfile in self.shapefiles if "Reach" in shpfile ]
         print('Pulling reach files...')
-        #timing and re-up creds every 30 mins
-        start = time.time()
-        for shpfile in rch_shpfile:
-            if self.creds: 
-                df = self.get_fsspec(shpfile)
-            else:
-                dbf = f"{shpfile.split('/')[-1].split('.')[0]}.dbf"
-                df = self.get_df(shpfile, dbf)
-                
+        # Credentials are refreshed every 30 mins as shapefiles are submitted
+        for shpfile, df in self.extract_parallel(rch_shpfile):
             extracted = self.extract_reach(df)
             if extracted:
                 all_shps.append(shpfile)
                 c = Path(shpfile).name.split('_')[5]
                 p = Path(shpfile).name.split('_')[6]
                 self.obs_times.append(self.cycle_pass[f"{c}_{p}"])
-            end = time.time()
-            time_delta = end-start
-            if time_delta > 1800:
-                self.creds = self.get_creds()
-                creds = self.creds
-                start = time.time()
+
+        self.stack_reach()
 
         mapping_dict[self.swot_id] = all_shps
         import json
@@ -183,13 +198,7 @@ class ExtractRiver(ExtractStrategy):
         #is there a cas where there is a reach shapefile and not a node shapefile
 
 
-        for shpfile in node_shpfile:
-            if self.creds: 
-                # print(shpfile)
-                df = self.get_fsspec(shpfile)
-            else:
-                dbf = f"{shpfile.split('/')[-1].split('.')[0]}.dbf"
-                df = self.get_df(shpfile, dbf)
+        for shpfile, df in self.extract_parallel(node_shpfile):
             extracted = self.extract_node(df, t)
             if extracted:
                 t += 1
@@ -204,12 +213,6 @@ class ExtractRiver(ExtractStrategy):
                     for i in self.obs_times:
                         print(i)
                     raise ReachNodeMismatch
-            end = time.time()
-            time_delta = end-start
-            if time_delta > 1800:
-                self.creds = self.get_creds()
-                creds = self.creds
-                start = time.time()
             
         # Calculate d_x_area
         if np.all((self.data["reach"]["d_x_area"] == self.FLOAT_FILL)):
@@ -248,9 +251,17 @@ class ExtractRiver(ExtractStrategy):
             # Get a indexes of nodes in sorted dataframe
             df = df.sort_values(by=["node_id"], inplace=False)
             nx = np.searchsorted(self.node_ids, df["node_id"].tolist())
-            for var in self.NODE_VARS:
+            # Convert each dtype group in one pass; missing variables keep fill
+            groups = ((self.NODE_FLOAT_VARS, np.float64, np.nan),
+                      (self.NODE_INT_VARS, np.int64, self.INT_FILL))
+            for names, dtype, fill in groups:
+                block = extract_block(df, names, dtype, fill)
+                for i, var in enumerate(names):
+                    self.data["node"][var][nx,t] = block[:,i]
+            block = df.reindex(columns=list(self.NODE_STR_VARS)).to_numpy()
+            for i, var in enumerate(self.NODE_STR_VARS):
                 try:
-                    self.data["node"][var][nx,t] = df[var].to_numpy()
+                    self.data["node"][var][nx,t] = block[:,i]
                 except Exception as e:
                     print('indexing error occured dimensions were', 'nx', nx, 'by nt', t)
                     print(e)
@@ -275,12 +286,31 @@ class ExtractRiver(ExtractStrategy):
         df["reach_id"] = df["reach_id"].astype("string")
         df = df.loc[df["reach_id"] == self.swot_id]
         if not df.empty:
-            # Append data into dictionary numpy arrays
-            for var in self.REACH_VARS:
-                self.data["reach"][var] = np.append(self.data["reach"][var], df[var])
+            # Store one block per dtype group, stacked after all shapefiles
+            self.reach_blocks["float"].append(extract_block(df, self.REACH_FLOAT_VARS, np.float64, np.nan))
+            self.reach_blocks["int"].append(extract_block(df, self.REACH_INT_VARS, np.int64, self.INT_FILL))
+            self.reach_blocks["str"].append(df.reindex(columns=list(self.REACH_STR_VARS)).to_numpy())
             return True
         else:
             return False
+
+    def stack_reach(self):
+        """Stack extracted reach data blocks into the reach data dictionary.
+        
+        Each dtype group is concatenated once and every variable is stored as
+        a contiguous row of the transposed block.
+        """
+
+        groups = ((self.REACH_FLOAT_VARS, "float", np.float64),
+                  (self.REACH_INT_VARS, "int", np.int64),
+                  (self.REACH_STR_VARS, "str", object))
+        for names, group, dtype in groups:
+            if self.reach_blocks[group]:
+                block = np.ascontiguousarray(np.concatenate(self.reach_blocks[group]).T)
+            else:
+                block = np.empty((len(names), 0), dtype=dtype)
+            for i, var in enumerate(names):
+                self.data["reach"][var] = block[i]
                 
 # Functions
 def calculate_d_x_a(wse, width):
@@ -328,4 +358,33 @@ def create_node_dict(nx, nt):
         "xovr_cal_q" : np.full((nx, nt), -999, int),
         "time": np.full((nx, nt), np.nan, dtype=np.float64),
         "time_str": np.full((nx, nt), np.nan, dtype="S20")
-    }
\ No newline at end of file
+    }
+
+def extract_block(df, names, dtype, fill):
+    """Return dataframe columns as a single numpy array of dtype.
+    
+    Values are converted through float64 so that blank (None) values become
+    NaN and are replaced with fill before casting. Variables missing from the
+    dataframe are logged and filled.
+    
+    Parameters
+    ----------
+    df: Pandas.DataFrame
+        dataframe of SWOT data
+    names: tuple
+        names of variables to extract, one column each
+    dtype: numpy.dtype
+        data type of returned array
+    fill: float or int
+        value to use for blank and missing values
+        
+    Returns
+    -------
+    numpy.ndarray with one column per variable
+    """
+    
+    for name in names:
+        if name not in df.columns:
+            print(f"Error extracting {name}: variable not found in shapefile, storing fill value")
+    block = df.reindex(columns=list(names)).to_numpy(dtype=np.float64)
+    return np.where(np.isnan(block), fill, block).astype(dtype, copy=False)
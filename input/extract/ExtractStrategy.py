@@ -1,10 +1,16 @@
 # Standard imports
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import io
+import threading
+import time
 import zipfile
 
 # Third-party imports
-import fsspec
+import numpy as np
 import pandas as pd
+import s3fs
 import shapefile
 
 # Class
@@ -15,6 +21,10 @@ class ExtractStrategy(metaclass=ABCMeta):
 
     Attributes
     ----------
+    CREDS_REFRESH: int
+        number of seconds after which S3 credentials are refreshed
+    MAX_IN_FLIGHT: int
+        maximum number of shapefiles fetched or held at once by extract_parallel
     swot_id: int
             unique SWOT identifier (identifies continent)       
     cycle_pass: list
@@ -28,8 +38,23 @@ class ExtractStrategy(metaclass=ABCMeta):
         extracts data from S3 bucket shapefiles and stores in data dictionaries.
     extract_local()
         extracts data from local file system and stores in data dictionaries.
+    extract_parallel(shapefiles, max_workers)
+        concurrently fetch shapefiles and yield their dataframes in order.
+    get_creds()
+        return AWS S3 credentials to access S3 shapefiles.
+    get_dataframe(shpfile)
+        return dataframe from S3 hosted or local SWOT shapefile.
+    get_filesystem()
+        return S3 filesystem shared across shapefile reads.
+    get_schema(fields)
+        return DBF field names and column data types, memoized by fields.
+    refresh_creds()
+        refresh S3 credentials once they are older than CREDS_REFRESH.
     """
     
+    CREDS_REFRESH = 1800
+    MAX_IN_FLIGHT = 4
+
     def __init__(self, swot_id, shapefiles, cycle_pass, output_dir, creds=None):
         """
         Parameters
@@ -50,6 +75,11 @@ class ExtractStrategy(metaclass=ABCMeta):
         self.cycle_pass = cycle_pass
         self.output_dir = output_dir
         self.creds = creds
+        self._creds_time = time.time()
+        self._fs = None
+        self._fs_creds = None
+        self._fs_lock = threading.Lock()
+        self._field_cache = {}
     
     @classmethod
     def __subclasshook__(cls, subclass):
@@ -62,28 +92,152 @@ class ExtractStrategy(metaclass=ABCMeta):
         """Extracts data from confluence_fs S3 bucket and stores in data dict."""
 
         raise NotImplementedError
+
+    def extract_parallel(self, shapefiles, max_workers=None):
+        """Concurrently fetch shapefiles and yield their dataframes in order.
+
+        Fetching and parsing is I/O bound so a thread pool keeps several S3
+        requests in flight while the caller processes completed dataframes.
+        Shapefiles are submitted only as earlier results are consumed so that
+        at most max_workers dataframes are fetched or held at once, and
+        credentials are refreshed before each submission.
+
+        Parameters
+        ----------
+        shapefiles: list
+            list of SWOT shapefiles
+        max_workers: int
+            maximum number of shapefiles in flight, defaults to MAX_IN_FLIGHT
+
+        Yields
+        ------
+        tuple of shapefile name and dataframe of SWOT data
+        """
+
+        if max_workers is None:
+            max_workers = self.MAX_IN_FLIGHT
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = deque()
+        try:
+            for shpfile in shapefiles:
+                if len(pending) == max_workers:
+                    name, future = pending.popleft()
+                    yield name, future.result()
+                self.refresh_creds()
+                pending.append((shpfile, executor.submit(self.get_dataframe, shpfile)))
+            while pending:
+                name, future = pending.popleft()
+                yield name, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def get_creds(self):
+        """Return AWS S3 credentials to access S3 shapefiles.
+        
+        Credentials passed at construction are reused unless a subclass
+        fetches new ones.
+        """
+        
+        return self.creds
+
+    def get_dataframe(self, shpfile):
+        """Return dataframe from S3 hosted or local SWOT shapefile."""
+
+        if self.creds:
+            return self.get_fsspec(shpfile)
+        dbf = f"{shpfile.split('/')[-1].split('.')[0]}.dbf"
+        return self.get_df(shpfile, dbf)
+    
+    def get_filesystem(self):
+        """Return S3 filesystem shared across shapefile reads.
+        
+        The filesystem is created on first use and rebuilt only when the
+        credentials are refreshed so that the S3 client and its connections
+        are reused for every shapefile.
+        """
+        
+        with self._fs_lock:
+            if self._fs is None or self._fs_creds is not self.creds:
+                self._fs = s3fs.S3FileSystem(anon=False,
+                                             key=self.creds["access_key"], 
+                                             secret=self.creds["secret"], 
+                                             token=self.creds["token"],
+                                             default_block_size=8*1024*1024,
+                                             skip_instance_cache=False)
+                self._fs_creds = self.creds
+            return self._fs
     
     def get_fsspec(self, shpfile):
         """Return dataframe from S3 hosted SWOT shapefile."""
         
-        # Determine execution environment
-        with fsspec.open(f"{shpfile}", mode="rb", anon=False, 
-                            key=self.creds["access_key"], 
-                            secret=self.creds["secret"], 
-                            token=self.creds["token"]) as shp:
-            
+        with self.get_filesystem().open(f"{shpfile}", mode="rb") as shp:
             dbf = f"{shpfile.split('/')[-1].split('.')[0]}.dbf"
             df = self.get_df(shp, dbf)
         return df      
     
     def get_df(self, shpfile, dbf_file):
-        """Return a dataframe of SWOT data from shapefile."""
+        """Return a dataframe of SWOT data from shapefile.
+        
+        The DBF file is read out of the zip once and pyshp records are written
+        straight into one preallocated numpy array per field.
+        """
+        
+        # Locate and read DBF file
+        with zipfile.ZipFile(shpfile, 'r') as zip_file:
+            dbf_bytes = zip_file.read(dbf_file)
+        sf = shapefile.Reader(dbf=io.BytesIO(dbf_bytes))
+        fieldnames, dtypes = self.get_schema(sf.fields[1:])
+        
+        # Deleted records are skipped by pyshp so columns are trimmed to the
+        # number of records read
+        columns = [ np.empty(len(sf), dtype=dtype) for dtype in dtypes ]
+        count = 0
+        for record in sf.iterRecords():
+            for column, value in zip(columns, record):
+                column[count] = value
+            count += 1
+        df = pd.DataFrame({ name: column[:count] for name, column 
+                           in zip(fieldnames, columns) }, copy=False)
+        
+        # Object columns get the data types pandas infers for pyshp records
+        return df.infer_objects()
+
+    def refresh_creds(self):
+        """Refresh S3 credentials once they are older than CREDS_REFRESH.
+        
+        Called before each shapefile is submitted so that workers never start
+        a fetch with expired credentials. Local extraction has no credentials
+        and is never refreshed.
+        """
+        
+        if self.creds and time.time() - self._creds_time > self.CREDS_REFRESH:
+            creds = self.get_creds()
+            if creds:
+                self.creds = creds
+            self._creds_time = time.time()
+
+    def get_schema(self, fields):
+        """Return DBF field names and column data types, memoized by fields.
+        
+        Every shapefile of the same SWOT product shares one schema so the
+        names and data types are only built the first time a set of fields
+        is seen. Decimal fields are float64 so that blank values are NaN, all
+        other fields keep the values pyshp returns in object columns.
+        
+        Parameters
+        ----------
+        fields: list
+            list of pyshp DBF field descriptors without the deletion flag
+        """
         
-        # Locate and open DBF file            
-        zip_file = zipfile.ZipFile(shpfile, 'r')
-        with zip_file.open(dbf_file) as dbf:
-            sf = shapefile.Reader(dbf=dbf)
-            fieldnames = [f[0] for f in sf.fields[1:]]
-            records = sf.records()
-            df = pd.DataFrame(columns=fieldnames, data=records)
-        return df
\ No newline at end of file
+        key = tuple((f[0], f[1], f[2], f[3]) for f in fields)
+        schema = self._field_cache.get(key)
+        if schema is None:
+            fieldnames = tuple(f[0] for f in key)
+            dtypes = tuple(np.dtype(np.float64) if f[1] in ("N", "F") and f[3] 
+                           else np.dtype(object) for f in key)
+            schema = (fieldnames, dtypes)
+            self._field_cache[key] = schema
+        return schema
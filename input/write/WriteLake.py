@@ -1,9 +1,30 @@
 # Third-party imports
-from netCDF4 import stringtochar
 import numpy as np
 
 # Local imports
-from input.write.WriteStrategy import WriteStrategy
+from input.write.WriteStrategy import WriteStrategy, NT_ATTRS, TIME_STR_ATTRS, set_attributes, \
+    to_char_array
+
+# NetCDF variable attributes for lake data
+LAKE_ATTRS = {
+    "lake_id": {
+        "long_name": "lake ID(s) from prior database",
+        "comment": "List of identifiers of prior lakes that "
+            + "intersect the observed lake. The format of the identifier "
+            + "is CBBNNNNNNT, where C=continent code, B=basin code, N=lake "
+            + "counter within the basin, T=type. The different lake "
+            + "identifiers are separated by semicolons.",
+    },
+    "time_str": TIME_STR_ATTRS,
+    "delta_s_q": {
+        "long_name": "storage change computed by quadratic method",
+        "units": "km^3",
+        "valid_min": -1000,
+        "valid_max": 1000,
+        "comment": "Storage change with regards to the reference "
+            + "area and height from PLD; computed by the quadratic method.",
+    },
+}
 
 class WriteLake(WriteStrategy):
     """A class that extends WriteStrategy to write river data to NetCDF.
@@ -13,6 +34,10 @@ class WriteLake(WriteStrategy):
 
     Attributes
     ----------
+    CHUNK_BYTES: int
+        target size in bytes of a chunk of time series data
+    COMPRESSION: dict
+        compression keyword arguments passed to each time series variable
     node_ids: list
         list of string node identifiers
 
@@ -23,6 +48,9 @@ class WriteLake(WriteStrategy):
     write_data(dataset, data)
         writes SWOT data dictionaries to NetCDF files organized by continent
     """
+
+    CHUNK_BYTES = 16384
+    COMPRESSION = { "zlib": True, "complevel": 1, "shuffle": True }
     
     def __init__(self, swot_id, output_dir):
         """
@@ -47,12 +75,13 @@ class WriteLake(WriteStrategy):
             list of string cycle/pass identifiers
         """
 
-         # Create dimension and coordinate variable
+         # Create dimensions and coordinate variable
         dataset.createDimension("nt", len(obs_times))
+        dataset.createDimension("nchars", 10)
+        dataset.createDimension("chartime", 20)
         nt_v = dataset.createVariable("nt", "i4", ("nt",))
-        nt_v.units = "pass"
-        nt_v.long_name = "time steps"
-        nt_v[:] = range(len(obs_times))
+        set_attributes(nt_v, NT_ATTRS)
+        nt_v[:] = np.arange(len(obs_times), dtype=np.int32)
         
     def write_data(self, dataset, data):
         """Writes lake SWOT data to NetCDF format.
@@ -68,38 +97,28 @@ class WriteLake(WriteStrategy):
             dictionary of SWOT data variables
         """
         
-        dataset.createDimension('nchars', 10)
+        # Chunk time series up to CHUNK_BYTES without exceeding nt
+        nt = max(len(dataset.dimensions["nt"]), 1)
+
+        # Define variables
         lake_id_v = dataset.createVariable("lake_id", "S1", ("nchars",),
                                            fill_value=self.STR_FILL)
-        lake_id_v.long_name = "lake ID(s) from prior database"
-        lake_id_v.comment = "List of identifiers of prior lakes that " \
-            + "intersect the observed lake. The format of the identifier " \
-            + "is CBBNNNNNNT, where C=continent code, B=basin code, N=lake " \
-            + "counter within the basin, T=type. The different lake " \
-            + "identifiers are separated by semicolons."        
-        lake_id_v[:] = stringtochar(np.array(self.swot_id, dtype="S10"))
-        
-        dataset.createDimension('chartime', 20)
         time_str = dataset.createVariable("time_str", "S1", ("nt", "chartime"), 
-                                          fill_value=self.STR_FILL)
-        time_str.long_name = "UTC time"
-        time_str.standard_name = "time"
-        time_str.calendar = "gregorian"
-        time_str.tai_utc_difference = "[value of TAI-UTC at time of first record]"
-        time_str.leap_second = "YYYY-MM-DD hh:mm:ss"
-        time_str.comment = "Time string giving UTC time. The format is " \
-            + "YYYY-MM-DDThh:mm:ssZ, where the Z suffix indicates UTC time."
-        time_str[:] = stringtochar(data["time_str"].astype("S20"))
-        
-        delta_s_q = dataset.createVariable("delta_s_q", "f8", ("nt",), 
-                                           fill_value=self.FLOAT_FILL)
-        delta_s_q.long_name = "storage change computed by quadratic method"
-        delta_s_q.units = "km^3"
-        delta_s_q.valid_min = -1000
-        delta_s_q.valid_max = 1000
-        delta_s_q.comment = "Storage change with regards to the reference " \
-            + "area and height from PLD; computed by the quadratic method."
-        delta_s_q[:] = data["delta_s_q"]
-        
-        
-        
\ No newline at end of file
+                                          fill_value=self.STR_FILL,
+                                          chunksizes=(min(nt, self.CHUNK_BYTES // 20), 20),
+                                          **self.COMPRESSION)
+        delta_s_q = dataset.createVariable("delta_s_q", "f4", ("nt",), 
+                                           fill_value=self.FLOAT_FILL,
+                                           chunksizes=(min(nt, self.CHUNK_BYTES // 4),),
+                                           **self.COMPRESSION)
+
+        # Set attributes
+        set_attributes(lake_id_v, LAKE_ATTRS["lake_id"])
+        set_attributes(time_str, LAKE_ATTRS["time_str"])
+        set_attributes(delta_s_q, LAKE_ATTRS["delta_s_q"])
+
+        # Write data, arrays are written in full so skip masked array conversion
+        dataset.set_auto_maskandscale(False)
+        lake_id_v[:] = np.frombuffer(str(self.swot_id).encode().ljust(10, b"\0")[:10], dtype="S1")
+        time_str[:] = to_char_array(data["time_str"], 20)
+        delta_s_q[:] = np.asarray(data["delta_s_q"], dtype=np.float32)
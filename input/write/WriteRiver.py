@@ -1,9 +1,413 @@
 # Third-party imports
 import numpy as np
-from netCDF4 import stringtochar
 
 # Local imports
-from input.write.WriteStrategy import WriteStrategy
+from input.write.WriteStrategy import WriteStrategy, NT_ATTRS, TIME_STR_ATTRS, set_attributes, \
+    to_char_array
+
+# NetCDF variable attributes for the node coordinate variable
+NX_ATTRS = {
+    "units": "node",
+    "long_name": "number of nodes",
+}
+
+# NetCDF variable attributes shared by the node and reach groups
+REACH_ID_ATTRS = {
+    "long_name": "reach ID from prior river database",
+    "comment": "Unique reach identifier from the prior river "
+        + "database. The format of the identifier is CBBBBBRRRRT, where "
+        + "C=continent, B=basin, R=reach, T=type.",
+}
+
+TIME_ATTRS = {
+    "long_name": "time (UTC)",
+    "calendar": "gregorian",
+    "tai_utc_difference": "[value of TAI-UTC at time of first record]",
+    "leap_second": "YYYY-MM-DD hh:mm:ss",
+    "units": "seconds since 2000-01-01 00:00:00.000",
+    "comment": "Time of measurement in seconds in the UTC time "
+        + "scale since 1 Jan 2000 00:00:00 UTC. [tai_utc_difference] is "
+        + "the difference between TAI and UTC reference time (seconds) "
+        + "for the first measurement of the data set. If a leap second "
+        + "occurs within the data set, the metadata leap_second is set "
+        + "to the UTC time at which the leap second occurs.",
+}
+
+# NetCDF variable attributes for the node and reach groups
+NODE_ATTRS = {
+    "reach_id": REACH_ID_ATTRS,
+    "node_id": {
+        "long_name": "node ID of the node in the prior river database",
+        "comment": "Unique node identifier from the prior river "
+            + "database. The format of the identifier is CBBBBBRRRRNNNT, "
+            + "where C=continent, B=basin, R=reach, N=node, T=type.",
+    },
+    "time": TIME_ATTRS,
+    "time_str": TIME_STR_ATTRS,
+    "d_x_area": {
+        "long_name": "change in cross-sectional area",
+        "units": "m^2",
+        "valid_min": -10000000,
+        "valid_max": 10000000,
+        "comment": "Change in channel cross sectional area from the "
+            + "value reported in the prior river database. Extracted from "
+            + "reach-level and appended to node.",
+    },
+    "d_x_area_u": {
+        "long_name": "total uncertainty of the change in the cross-sectional area",
+        "units": "m^2",
+        "valid_min": 0,
+        "valid_max": 10000000,
+        "comment": "Total one-sigma uncertainty (random and systematic) "
+            + "in the change in the cross-sectional area. Extracted from "
+            + "reach-level and appended to node.",
+    },
+    "slope": {
+        "long_name": "water surface slope with respect to the geoid",
+        "units": "m/m",
+        "valid_min": -0.001,
+        "valid_max": 0.1,
+        "comment": "Fitted water surface slope relative to the geoid, "
+            + "and with the same corrections and geophysical fields applied as "
+            + "wse. The units are m/m. The upstream or downstream direction "
+            + "is defined by the prior river database. A positive slope "
+            + "means that the downstream WSE is lower.",
+    },
+    "slope_u": {
+        "long_name": "total uncertainty in the water surface slope",
+        "units": "m/m",
+        "valid_min": 0,
+        "valid_max": 0.1,
+        "comment": "Total one-sigma uncertainty (random and "
+            + "systematic) in the water surface slope, including "
+            + "uncertainties of corrections and variation about the fit.",
+    },
+    "slope2": {
+        "long_name": "enhanced water surface slope with respect to geoid",
+        "units": "m/m",
+        "valid_min": -0.001,
+        "valid_max": 0.1,
+        "comment": "Enhanced water surface slope relative to the "
+            + "geoid, produced using a smoothing of the node wse. The "
+            + "upstream or downstream direction is defined by the prior "
+            + "river database. A positive slope means that the downstream "
+            + "WSE is lower. Extracted from reach-level and appended to node.",
+    },
+    "slope2_u": {
+        "long_name": "uncertainty in the enhanced water surface slope",
+        "units": "m/m",
+        "valid_min": 0,
+        "valid_max": 0.1,
+        "comment": "Total one-sigma uncertainty (random and "
+            + "systematic) in the enhanced water surface slope, including "
+            + "uncertainties of corrections and variation about the fit. "
+            + "Extracted from reach-level and appended to node.",
+    },
+    "width": {
+        "long_name": "node width",
+        "units": "m",
+        "valid_min": 0.0,
+        "valid_max": 100000,
+        "comment": "Node width.",
+    },
+    "width_u": {
+        "long_name": "total uncertainty in the node width",
+        "units": "m",
+        "valid_min": 0,
+        "valid_max": 100000,
+        "comment": "Total one-sigma uncertainty (random and systematic) in the node width.",
+    },
+    "wse": {
+        "long_name": "water surface elevation with respect to the geoid",
+        "units": "m",
+        "valid_min": -1000,
+        "valid_max": 100000,
+        "comment": "Fitted node water surface elevation, relative to the "
+            + "provided model of the geoid (geoid_hght), with all "
+            + "corrections for media delays (wet and dry troposphere, and "
+            +" ionosphere), crossover correction, and tidal effects "
+            + "(solid_tide, load_tidef, and pole_tide) applied.",
+    },
+    "wse_u": {
+        "long_name": "total uncertainty in the water surface elevation",
+        "units": "m",
+        "valid_min": 0.0,
+        "valid_max": 999999,
+        "comment": "Total one-sigma uncertainty (random and systematic) "
+            + "in the node WSE, including uncertainties of corrections, and "
+            + "variation about the fit.",
+    },
+    "node_q": {
+        "long_name": "summary quality indicator for the node",
+        "standard_name": "status_flag",
+        "short_name": "node_qual",
+        "flag_meanings": "good suspect degraded bad",
+        "flag_values": "0 1 2 3",
+        "valid_min": 0,
+        "valid_max": 3,
+        "comment": "Summary quality indicator for the node "
+            + "measurement. Value of 0 indicates a nominal measurement, 1 "
+            + "indicates a suspect measurement, 2 indicates a degraded "
+            + "quality measurement, and 3 indicates a bad measurement.",
+    },
+    "dark_frac": {
+        "long_name": "fractional area of dark water",
+        "units": "1",
+        "valid_min": 0,
+        "valid_max": 1,
+        "comment": "Fraction of node area_total covered by dark water.",
+    },
+    "ice_clim_f": {
+        "long_name": "climatological ice cover flag",
+        "standard_name": "status_flag",
+        "source": "Yang et al. (2020)",
+        "flag_meanings": "no_ice_cover uncertain_ice_cover full_ice_cover",
+        "flag_values": "0 1 2",
+        "valid_min": 0,
+        "valid_max": 2,
+        "comment": "Climatological ice cover flag indicating "
+            + "whether the node is ice-covered on the day of the "
+            + "observation based on external climatological information "
+            + "(not the SWOT measurement). Values of 0, 1, and 2 indicate "
+            + "that the node is likely not ice covered, may or may not be "
+            + "partially or fully ice covered, and likely fully ice covered, "
+            + "respectively.",
+    },
+    "ice_dyn_f": {
+        "long_name": "dynamical ice cover flag",
+        "standard_name": "status_flag",
+        "source": "Yang et al. (2020)",
+        "flag_meanings": "no_ice_cover uncertain_ice_cover full_ice_cover",
+        "flag_values": "0 1 2",
+        "valid_min": 0,
+        "valid_max": 2,
+        "comment": "Dynamic ice cover flag indicating whether "
+            + "the surface is ice-covered on the day of the observation "
+            + "based on analysis of external satellite optical data. Values "
+            + "of 0, 1, and 2 indicate that the node is not ice covered, "
+            + "partially ice covered, and fully ice covered, respectively.",
+    },
+    "node_q_b": {
+        "long_name": "bitwise quality indicator for the node",
+        "standard_name": "status_flag",
+        "short_name": "node_qual_bitwise",
+        "flag_meanings": "sig0_qual_suspect classification_qual_suspect geolocation_qual_suspect water_fraction_suspect blocking_width_suspect bright_land few_sig0_observations few_area_observations few_wse_observations far_range_suspect near_range_suspect classification_qual_degraded geolocation_qual_degraded wse_outlier wse_bad no_sig0_observations no_area_observations no_wse_observations no_observations",
+        "flag_masks": "1 2 4 8 16 128 512 1024 2048 8192 16384 262144 524288 8388608 16777216 33554432 67108864 134217728 268435456",
+        "valid_min": 0,
+        "valid_max": 529297055,
+        "comment": "Bitwise quality indicator for the node "
+            + "measurement. If this word is interpreted as an unsigned "
+            + "integer, a value of 0 indicates good data, values greater "
+            + "than 0 but less than 262144 represent suspect data, values "
+            + "greater than or equal to 262144 but less than 8388608 "
+            + "represent degraded data, and values greater than or equal to "
+            + "8388608 represent bad data.",
+    },
+    "n_good_pix": {
+        "long_name": "number of pixels that have a valid WSE",
+        "units": "1",
+        "valid_min": 0,
+        "valid_max": 100000,
+        "comment": "Number of pixels assigned to the node that "
+            + "have a valid node WSE.",
+    },
+    "xovr_cal_q": {
+        "long_name": "quality of the cross-over calibration",
+        "flag_meanings": "good suspect bad",
+        "flag_values": "0 1 2",
+        "valid_min": 0,
+        "valid_max": 2,
+        "comment": "Quality of the cross-over calibration. A value "
+            + "of 0 indicates a nominal measurement, 1 indicates a suspect "
+            + "measurement, and 2 indicates a bad measurement.",
+    },
+}
+
+REACH_ATTRS = {
+    "reach_id": REACH_ID_ATTRS,
+    "time": TIME_ATTRS,
+    "time_str": TIME_STR_ATTRS,
+    "d_x_area": {
+        "long_name": "change in cross-sectional area",
+        "units": "m^2",
+        "valid_min": -10000000,
+        "valid_max": 10000000,
+        "comment": "Change in channel cross sectional area from the value "
+            + "reported in the prior river database.",
+    },
+    "d_x_area_u": {
+        "long_name": "total uncertainty of the change in the cross-sectional area",
+        "units": "m^2",
+        "valid_min": 0,
+        "valid_max": 10000000,
+        "comment": "Total one-sigma uncertainty (random and systematic) "
+            + "in the change in the cross-sectional area.",
+    },
+    "slope": {
+        "long_name": "water surface slope with respect to the geoid",
+        "units": "m/m",
+        "valid_min": -0.001,
+        "valid_max": 0.1,
+        "comment": "Fitted water surface slope relative to the geoid, "
+            + "and with the same corrections and geophysical fields applied as "
+            + "wse. The units are m/m. The upstream or downstream direction "
+            + "is defined by the prior river database. A positive slope "
+            + "means that the downstream WSE is lower.",
+    },
+    "slope_u": {
+        "long_name": "total uncertainty in the water surface slope",
+        "units": "m/m",
+        "valid_min": 0,
+        "valid_max": 0.1,
+        "comment": "Total one-sigma uncertainty (random and "
+            + "systematic) in the water surface slope, including "
+            + "uncertainties of corrections and variation about the fit.",
+    },
+    "slope2": {
+        "long_name": "enhanced water surface slope with respect to geoid",
+        "units": "m/m",
+        "valid_min": -0.001,
+        "valid_max": 0.1,
+        "comment": "Enhanced water surface slope relative to the "
+            + "geoid, produced using a smoothing of the node wse. The "
+            + "upstream or downstream direction is defined by the prior "
+            + "river database. A positive slope means that the downstream "
+            + "WSE is lower.",
+    },
+    "slope2_u": {
+        "long_name": "uncertainty in the enhanced water surface slope",
+        "units": "m/m",
+        "valid_min": 0,
+        "valid_max": 0.1,
+        "comment": "Total one-sigma uncertainty (random and "
+            + "systematic) in the enhanced water surface slope, including "
+            + "uncertainties of corrections and variation about the fit.",
+    },
+    "width": {
+        "long_name": "reach width",
+        "units": "m",
+        "valid_min": 0.0,
+        "valid_max": 100000,
+        "comment": "Reach width.",
+    },
+    "width_u": {
+        "long_name": "total uncertainty in the reach width",
+        "units": "m",
+        "valid_min": 0,
+        "valid_max": 100000,
+        "comment": "Total one-sigma uncertainty (random and systematic) in the reach width.",
+    },
+    "wse": {
+        "long_name": "water surface elevation with respect to the geoid",
+        "units": "m",
+        "valid_min": -1500,
+        "valid_max": 150000,
+        "comment": "Fitted reach water surface elevation, relative to the "
+            + "provided model of the geoid (geoid_hght), with corrections "
+            + "for media delays (wet and dry troposphere, and ionosphere), "
+            + "crossover correction, and tidal effects (solid_tide, "
+            + "load_tidef, and pole_tide) applied.",
+    },
+    "wse_u": {
+        "long_name": "total uncertainty in the water surface elevation",
+        "units": "m",
+        "valid_min": 0.0,
+        "valid_max": 999999,
+        "comment": "Total one-sigma uncertainty (random and systematic) "
+            + "in the reach WSE, including uncertainties of corrections, and "
+            + "variation about the fit.",
+    },
+    "reach_q": {
+        "long_name": "summary quality indicator for the reach",
+        "standard_name": "summary quality indicator for the reach",
+        "flag_meanings": "good suspect degraded bad",
+        "flag_values": "0 1 2 3",
+        "valid_min": 0,
+        "valid_max": 3,
+        "comment": "Summary quality indicator for the reach "
+            + "measurement. A value of 0 indicates a nominal measurement, 1 "
+            + "indicates a suspect measurement, 2 indicates a degraded "
+            + "measurement, and 3 indicates a bad measurement.",
+    },
+    "dark_frac": {
+        "long_name": "fractional area of dark water",
+        "units": "1",
+        "valid_min": -1000,
+        "valid_max": 10000,
+        "comment": "Fraction of reach area_total covered by dark water.",
+    },
+    "ice_clim_f": {
+        "long_name": "climatological ice cover flag",
+        "standard_name": "status_flag",
+        "source": "Yang et al. (2020)",
+        "flag_meanings": "no_ice_cover uncertain_ice_cover full_ice_cover",
+        "flag_values": "0 1 2",
+        "valid_min": 0,
+        "valid_max": 2,
+        "comment": "Climatological ice cover flag indicating "
+            + "whether the reach is ice-covered on the day of the "
+            + "observation based on external climatological information "
+            + "(not the SWOT measurement). Values of 0, 1, and 2 indicate "
+            + "that the reach is likely not ice covered, may or may not be "
+            + "partially or fully ice covered, and likely fully ice covered, "
+            + "respectively.",
+    },
+    "ice_dyn_f": {
+        "long_name": "dynamical ice cover flag",
+        "standard_name": "status_flag",
+        "source": "Yang et al. (2020)",
+        "flag_meanings": "no_ice_cover uncertain_ice_cover full_ice_cover",
+        "flag_values": "0 1 2",
+        "valid_min": 0,
+        "valid_max": 2,
+        "comment": "Dynamic ice cover flag indicating whether "
+            + "the surface is ice-covered on the day of the observation "
+            + "based on analysis of external satellite optical data. Values "
+            + "of 0, 1, and 2 indicate that the reach is not ice covered, "
+            + "partially ice covered, and fully ice covered, respectively.",
+    },
+    "partial_f": {
+        "long_name": "partial reach coverage flag",
+        "standard_name": "status_flag",
+        "flag_meanings": "covered not_covered",
+        "flag_values": "0 1",
+        "valid_min": 0,
+        "valid_max": 1,
+        "comment": "Flag that indicates only partial reach "
+            + "coverage. The flag is 0 if at least half the nodes of the "
+            + "reach have valid WSE measurements; the flag is 1 otherwise "
+            + "and reach-level quantities are not computed.",
+    },
+    "n_good_nod": {
+        "long_name": "number of nodes in the reach that have a "
+            + "valid WSE",
+        "units": "1",
+        "valid_min": 0,
+        "valid_max": 100,
+        "comment": "Number of nodes in the reach that have "
+            + "a valid node WSE. Note that the total number of nodes "
+            + "from the prior river database is given by p_n_nodes.",
+    },
+    "obs_frac_n": {
+        "long_name": "fraction of nodes that have a valid WSE",
+        "units": "1",
+        "valid_min": 0,
+        "valid_max": 1,
+        "comment": "Fraction of nodes (n_good_nod/p_n_nodes) "
+            + "in the reach that have a valid node WSE. The value is "
+            + "between 0 and 1.",
+    },
+    "xovr_cal_q": {
+        "long_name": "quality of the cross-over calibration",
+        "flag_meanings": "good suspect bad",
+        "flag_values": "0 1 2",
+        "valid_min": 0,
+        "valid_max": 2,
+        "comment": "Quality of the cross-over calibration. A value "
+            + "of 0 indicates a nominal measurement, 1 indicates a suspect "
+            + "measurement, and 2 indicates a bad measurement.",
+    },
+}
 
 class WriteRiver(WriteStrategy):
     """A class that extends WriteStrategy to write river data to NetCDF.
@@ -13,8 +417,34 @@ class WriteRiver(WriteStrategy):
 
     Attributes
     ----------
+    COMPRESSION: dict
+        compression keyword arguments passed to each node data variable
+    COUNT_FILL: int
+        value to use when missing or invalid data is encountered for uint8 counts
+    FLAG_FILL: int
+        value to use when missing or invalid data is encountered for flags
+    LEAST_SIGNIFICANT_DIGIT: dict
+        variable names (keys) and decimal digits of precision to retain (values)
+    MAX_NODE_CHUNK: int
+        maximum number of nodes stored in a single chunk
+    MIN_REACH_COMPRESS: int
+        minimum size in bytes of a reach variable that is compressed
+    NODE_FLAGS: tuple
+        names of node-level int8 flag variables
+    NODE_VARS: tuple
+        names, NetCDF data types and dimensions of node-level variables
+    REACH_COMPRESSION: dict
+        compression keyword arguments passed to large reach data variables
+    REACH_FLAGS: tuple
+        names of reach-level int8 flag variables
+    REACH_VARS: tuple
+        names, NetCDF data types and dimensions of reach-level variables
+    SAC_SENTINELS: dict
+        variable names (keys) and sac-specific missing values (values)
     node_ids: list
         list of string node identifiers
+    skip_empty: bool
+        indicates whether to skip writing node variables without valid data
 
     Methods
     -------
@@ -22,13 +452,54 @@ class WriteRiver(WriteStrategy):
         create dimensions and coordinate variables for dataset
     write_data()
         writes SWOT data dictionaries to NetCDF files organized by continent
-    __write_node_vars(dataset, reach_id, node_ids)
+    __write_node_vars(dataset, reach_id, node_ids, chunksizes)
         writes node level data to NetCDF file in node group
-    __write_reach_vars(dataset, reach_id)
+    __write_reach_vars(dataset, reach_id, nt)
         writes reach level data to NetCDF file in reach group
+    __write_reach_id(dataset, reach_id)
+        create scalar reach identifier variable and write reach_id to it
+    __fill_value(datatype)
+        return fill value of NetCDF variables of datatype
+    __find_empty(arrays, names)
+        return names of variables that only hold missing values
     """
 
-    def __init__(self, swot_id, output_dir, node_ids):
+    COMPRESSION = { "zlib": True, "complevel": 4, "shuffle": True }
+    COUNT_FILL = 255
+    FLAG_FILL = -1
+    # Slopes span several orders of magnitude below 1e-3 so any fixed number 
+    # of decimal digits loses relative precision, they are left unquantized
+    LEAST_SIGNIFICANT_DIGIT = { "width": 2, "width_u": 2, "wse": 2, "wse_u": 2, 
+        "dark_frac": 4, "obs_frac_n": 4, "d_x_area": 1, "d_x_area_u": 1 }
+    MAX_NODE_CHUNK = 256
+    MIN_REACH_COMPRESS = 8192
+    NODE_FLAGS = ("node_q", "ice_clim_f", "ice_dyn_f", "xovr_cal_q")
+    NODE_VARS = (("time", "f8", ("nx", "nt")), 
+        ("time_str", "S1", ("nx", "nt", "chartime")),
+        ("d_x_area", "f8", ("nx", "nt")), ("d_x_area_u", "f8", ("nx", "nt")), 
+        ("slope", "f4", ("nx", "nt")), ("slope_u", "f4", ("nx", "nt")), 
+        ("slope2", "f4", ("nx", "nt")), ("slope2_u", "f4", ("nx", "nt")), 
+        ("width", "f4", ("nx", "nt")), ("width_u", "f4", ("nx", "nt")), 
+        ("wse", "f8", ("nx", "nt")), ("wse_u", "f8", ("nx", "nt")), 
+        ("node_q", "i1", ("nx", "nt")), ("dark_frac", "f4", ("nx", "nt")), 
+        ("ice_clim_f", "i1", ("nx", "nt")), ("ice_dyn_f", "i1", ("nx", "nt")), 
+        ("node_q_b", "i4", ("nx", "nt")), ("n_good_pix", "i4", ("nx", "nt")), 
+        ("xovr_cal_q", "i1", ("nx", "nt")))
+    REACH_COMPRESSION = { "zlib": True, "complevel": 1, "shuffle": True }
+    REACH_FLAGS = ("reach_q", "ice_clim_f", "ice_dyn_f", "partial_f", "xovr_cal_q")
+    REACH_VARS = (("time", "f8", ("nt",)), ("time_str", "S1", ("nt", "chartime")),
+        ("d_x_area", "f8", ("nt",)), ("d_x_area_u", "f8", ("nt",)), 
+        ("slope", "f4", ("nt",)), ("slope_u", "f4", ("nt",)), 
+        ("slope2", "f4", ("nt",)), ("slope2_u", "f4", ("nt",)), 
+        ("width", "f4", ("nt",)), ("width_u", "f4", ("nt",)), 
+        ("wse", "f8", ("nt",)), ("wse_u", "f8", ("nt",)), 
+        ("reach_q", "i1", ("nt",)), ("dark_frac", "f4", ("nt",)), 
+        ("ice_clim_f", "i1", ("nt",)), ("ice_dyn_f", "i1", ("nt",)), 
+        ("partial_f", "i1", ("nt",)), ("n_good_nod", "u1", ("nt",)), 
+        ("obs_frac_n", "f4", ("nt",)), ("xovr_cal_q", "i1", ("nt",)))
+    SAC_SENTINELS = { "time": (-999999999999,), "d_x_area": (-1.e+12, -999999999999), "n_good_pix": (-99999999,) }
+
+    def __init__(self, swot_id, output_dir, node_ids, skip_empty=True):
         """
         Parameters
         ----------
@@ -38,10 +509,14 @@ class WriteRiver(WriteStrategy):
             path to output directory on EFS 'input' mount
         node_ids: list
             list of string node identifiers
+        skip_empty: bool
+            indicates whether to skip writing node variables without valid data
         """
         
         super().__init__(swot_id, output_dir)
         self.node_ids = node_ids
+        self._node_ids_arr = np.asarray(node_ids, dtype=np.int64)
+        self.skip_empty = skip_empty
 
     def create_dimensions(self, dataset, obs_times):
         """Create dimensions and coordinate variables for dataset.
@@ -60,14 +535,12 @@ class WriteRiver(WriteStrategy):
 
         # Create coordinate variable(s)
         nt_v = dataset.createVariable("nt", "i4", ("nt",))
-        nt_v.units = "pass"
-        nt_v.long_name = "time steps"
-        nt_v[:] = range(len(obs_times))
+        set_attributes(nt_v, NT_ATTRS)
+        nt_v[:] = np.arange(len(obs_times), dtype=np.int32)
 
         nx_v = dataset.createVariable("nx", "i4", ("nx",))
-        nx_v.units = "node"
-        nx_v.long_name = "number of nodes"
-        nx_v[:] = range(1, len(self.node_ids) + 1)
+        set_attributes(nx_v, NX_ATTRS)
+        nx_v[:] = np.arange(1, len(self.node_ids) + 1, dtype=np.int32)
 
     def write_data(self, dataset, data):
         """Writes node and reach level SWOT data to NetCDF format.
@@ -83,12 +556,18 @@ class WriteRiver(WriteStrategy):
             dictionary of SWOT data variables
         """
 
+        # Chunk node variables over all time steps and up to MAX_NODE_CHUNK 
+        # nodes, reach variables are a single chunk over all time steps
+        nt = max(len(dataset.dimensions["nt"]), 1)
+        nx = max(min(len(self.node_ids), self.MAX_NODE_CHUNK), 1)
+
         reach_group = dataset.createGroup("reach")
-        self.__write_reach_vars(reach_group, data, self.swot_id)
+        self.__write_reach_vars(reach_group, data, self.swot_id, nt)
         node_group = dataset.createGroup("node")
-        self.__write_node_vars(node_group, data, self.swot_id, self.node_ids)
+        self.__write_node_vars(node_group, data, self.swot_id, self._node_ids_arr,
+            (nx, nt))
         
-    def __write_node_vars(self, dataset, data, reach_id, node_ids):
+    def __write_node_vars(self, dataset, data, reach_id, node_ids, chunksizes):
         """Create and write reach-level variables to NetCDF4 dataset.
 
         TODO:
@@ -101,264 +580,124 @@ class WriteRiver(WriteStrategy):
             dictionary of SWOT data variables
         reach_id: str
             unique reach identifier value
-        node_ids: list
-            list of string node identifiers
+        node_ids: numpy.ndarray
+            int64 node identifiers
+        chunksizes: tuple
+            chunk shape for (nx, nt) variables
+        """
+
+        node = data["node"]
+        empty = self.__find_empty(node, [name for name, datatype, _ 
+            in self.NODE_VARS if datatype != "S1"])
+
+        self.__write_reach_id(dataset, reach_id)
+
+        node_ids_v = dataset.createVariable("node_id", "i8", ("nx",),
+            chunksizes=chunksizes[:1], **self.COMPRESSION)
+        set_attributes(node_ids_v, NODE_ATTRS["node_id"])
+
+        dataset.createDimension('chartime', 20)
+
+        # Variables without valid data are prefilled as they are not written
+        for name, datatype, dimensions in self.NODE_VARS:
+            if name in empty:
+                dataset.set_fill_on()
+            variable = dataset.createVariable(name, datatype, dimensions,
+                fill_value=self.__fill_value(datatype), 
+                chunksizes=(*chunksizes, 20)[:len(dimensions)], **self.COMPRESSION,
+                least_significant_digit=self.LEAST_SIGNIFICANT_DIGIT.get(name))
+            if name in empty:
+                dataset.set_fill_off()
+            set_attributes(variable, NODE_ATTRS[name])
+
+        # Write data once every variable has been defined, arrays are already 
+        # filled so skip masked array conversion and variables without valid 
+        # data were prefilled when they were defined
+        dataset.set_auto_maskandscale(False)
+        scratch_f4 = np.empty(node["width"].shape, dtype=np.float32)
+        scratch_i4 = np.empty(node["width"].shape, dtype=np.int32)
+        node_ids_v[:] = node_ids
+        dataset["time_str"][:] = to_char_array(node["time_str"], 20)
+        for name in ("time", "d_x_area"):    # sac-specific
+            if name not in empty:
+                dataset[name][:] = replace_sentinels(node[name], self.SAC_SENTINELS[name], self.FLOAT_FILL)
+        for name, datatype, _ in self.NODE_VARS:
+            if datatype in ("f4", "f8") and name not in self.SAC_SENTINELS \
+                and name not in empty:
+                scratch = scratch_f4 if datatype == "f4" else None
+                dataset[name][:] = fill_missing(node[name], self.FLOAT_FILL, np.dtype(datatype), scratch)
+        if "node_q_b" not in empty:
+            dataset["node_q_b"][:] = fill_missing(node["node_q_b"], self.INT_FILL, np.int32, scratch_i4)
+        if "n_good_pix" not in empty:
+            replace_sentinels(node["n_good_pix"], self.SAC_SENTINELS["n_good_pix"], self.INT_FILL)    # sac-specific
+            dataset["n_good_pix"][:] = fill_missing(node["n_good_pix"], self.INT_FILL, np.int32, scratch_i4)
+        flags = fill_flags([node[name] for name in self.NODE_FLAGS], self.INT_FILL, self.FLAG_FILL)
+        for name, values in zip(self.NODE_FLAGS, flags):
+            if name not in empty:
+                dataset[name][:] = values
+
+    def __write_reach_id(self, dataset, reach_id):
+        """Create scalar reach identifier variable and write reach_id to it.
+
+        Parameters
+        ----------
+        dataset: netCDF4.Dataset
+            node-level or reach-level dataset to write variable to
+        reach_id: str
+            unique reach identifier value
         """
 
         reach_id_v = dataset.createVariable("reach_id", "i8")
-        reach_id_v.long_name = "reach ID from prior river database"
-        reach_id_v.comment = "Unique reach identifier from the prior river " \
-            + "database. The format of the identifier is CBBBBBRRRRT, where " \
-            + "C=continent, B=basin, R=reach, T=type."
+        set_attributes(reach_id_v, REACH_ID_ATTRS)
         reach_id_v.assignValue(int(reach_id))
 
-        node_ids_v = dataset.createVariable("node_id", "i8", ("nx",))
-        node_ids_v.long_name = "node ID of the node in the prior river database"
-        node_ids_v.comment = "Unique node identifier from the prior river " \
-            + "database. The format of the identifier is CBBBBBRRRRNNNT, " \
-            + "where C=continent, B=basin, R=reach, N=node, T=type."
-        node_ids_v[:] = np.array(node_ids, dtype=np.int64)
-        
-        time = dataset.createVariable("time", "f8", ("nx", "nt"), 
-            fill_value=self.FLOAT_FILL)
-        time.long_name = "time (UTC)"
-        time.calendar = "gregorian"
-        time.tai_utc_difference = "[value of TAI-UTC at time of first record]"
-        time.leap_second = "YYYY-MM-DD hh:mm:ss"
-        time.units = "seconds since 2000-01-01 00:00:00.000"
-        time.comment = "Time of measurement in seconds in the UTC time " \
-            + "scale since 1 Jan 2000 00:00:00 UTC. [tai_utc_difference] is " \
-            + "the difference between TAI and UTC reference time (seconds) " \
-            + "for the first measurement of the data set. If a leap second " \
-            + "occurs within the data set, the metadata leap_second is set " \
-            + "to the UTC time at which the leap second occurs."
-        data["node"]["time"][np.isclose(data["node"]["time"], -999999999999)] = self.FLOAT_FILL    # sac-specific
-        time[:] = np.nan_to_num(data["node"]["time"], copy=True, nan=self.FLOAT_FILL)
-        
-        dataset.createDimension('chartime', 20)
-        time_str = dataset.createVariable("time_str", "S1", ("nx", "nt", "chartime"), 
-                                          fill_value=self.STR_FILL)
-        time_str.long_name = "UTC time"
-        time_str.standard_name = "time"
-        time_str.calendar = "gregorian"
-        time_str.tai_utc_difference = "[value of TAI-UTC at time of first record]"
-        time_str.leap_second = "YYYY-MM-DD hh:mm:ss"
-        time_str.comment = "Time string giving UTC time. The format is " \
-            + "YYYY-MM-DDThh:mm:ssZ, where the Z suffix indicates UTC time."
-        time_str[:] = stringtochar(data["node"]["time_str"])
-
-        dxa = dataset.createVariable("d_x_area", "f8", ("nx", "nt"),
-            fill_value=self.FLOAT_FILL)
-        dxa.long_name = "change in cross-sectional area"
-        dxa.units = "m^2"
-        dxa.valid_min = -10000000
-        dxa.valid_max = 10000000
-        dxa.comment = "Change in channel cross sectional area from the " \
-            + "value reported in the prior river database. Extracted from " \
-            + "reach-level and appended to node."
-        data["node"]["d_x_area"][np.isclose(data["node"]["d_x_area"], -1.e+12)] = np.nan    # sac-specific
-        dxa[:] = np.nan_to_num(data["node"]["d_x_area"], copy=True, nan=self.FLOAT_FILL)
-
-        dxa_u = dataset.createVariable("d_x_area_u", "f8", ("nx", "nt"),
-            fill_value=self.FLOAT_FILL)
-        dxa_u.long_name = "total uncertainty of the change in the cross-sectional area"
-        dxa_u.units = "m^2"
-        dxa_u.valid_min = 0
-        dxa_u.valid_max = 10000000
-        dxa_u.comment = "Total one-sigma uncertainty (random and systematic) " \
-            + "in the change in the cross-sectional area. Extracted from " \
-            + "reach-level and appended to node."
-        dxa_u[:] = np.nan_to_num(data["node"]["d_x_area_u"], copy=True, nan=self.FLOAT_FILL)
-        
-        slope = dataset.createVariable("slope", "f8", ("nx", "nt"),
-            fill_value=self.FLOAT_FILL)
-        slope.long_name = "water surface slope with respect to the geoid"
-        slope.units = "m/m"
-        slope.valid_min = -0.001
-        slope.valid_max = 0.1
-        slope.comment = "Fitted water surface slope relative to the geoid, " \
-            + "and with the same corrections and geophysical fields applied as " \
-            + "wse. The units are m/m. The upstream or downstream direction " \
-            + "is defined by the prior river database. A positive slope " \
-            + "means that the downstream WSE is lower."
-        slope[:] = np.nan_to_num(data["node"]["slope"], copy=True, nan=self.FLOAT_FILL)
-
-        slope_u = dataset.createVariable("slope_u", "f8", ("nx", "nt"),
-            fill_value=self.FLOAT_FILL)
-        slope_u.long_name = "total uncertainty in the water surface slope"
-        slope_u.units = "m/m"
-        slope_u.valid_min = 0
-        slope_u.valid_max = 0.1
-        slope_u.comment = "Total one-sigma uncertainty (random and " \
-            + "systematic) in the water surface slope, including " \
-            + "uncertainties of corrections and variation about the fit."
-        slope_u[:] = np.nan_to_num(data["node"]["slope_u"], copy=True, nan=self.FLOAT_FILL)
-
-        slope2 = dataset.createVariable("slope2", "f8", ("nx", "nt"),
-            fill_value=self.FLOAT_FILL)
-        slope2.long_name = "enhanced water surface slope with respect to geoid"
-        slope2.units = "m/m"
-        slope2.valid_min = -0.001
-        slope2.valid_max = 0.1
-        slope2.comment = "Enhanced water surface slope relative to the " \
-            + "geoid, produced using a smoothing of the node wse. The " \
-            + "upstream or downstream direction is defined by the prior " \
-            + "river database. A positive slope means that the downstream " \
-            + "WSE is lower. Extracted from reach-level and appended to node."
-        slope2[:] = np.nan_to_num(data["node"]["slope2"], copy=True, nan=self.FLOAT_FILL)
-
-        slope2_u = dataset.createVariable("slope2_u", "f8", ("nx", "nt"),
-            fill_value=self.FLOAT_FILL)
-        slope2_u.long_name = "uncertainty in the enhanced water surface slope"
-        slope2_u.units = "m/m"
-        slope2_u.valid_min = 0
-        slope2_u.valid_max = 0.1
-        slope2_u.comment = "Total one-sigma uncertainty (random and " \
-            + "systematic) in the enhanced water surface slope, including " \
-            + "uncertainties of corrections and variation about the fit. " \
-            + "Extracted from reach-level and appended to node."
-        slope2_u[:] = np.nan_to_num(data["node"]["slope2_u"], copy=True, nan=self.FLOAT_FILL)
-
-        width = dataset.createVariable("width", "f8", ("nx", "nt"), 
-            fill_value = self.FLOAT_FILL)
-        width.long_name = "node width"
-        width.units = "m"
-        width.valid_min = 0.0
-        width.valid_max = 100000
-        width.comment = "Node width."
-        width[:] = np.nan_to_num(data["node"]["width"], copy=True, nan=self.FLOAT_FILL)
-
-        width_u = dataset.createVariable("width_u", "f8", ("nx", "nt"), 
-            fill_value = self.FLOAT_FILL)
-        width_u.long_name = "total uncertainty in the node width"
-        width_u.units = "m"
-        width_u.valid_min = 0
-        width_u.valid_max = 100000
-        width_u.comment = "Total one-sigma uncertainty (random and systematic) in the node width."
-        width_u[:] = np.nan_to_num(data["node"]["width_u"], copy=True, nan=self.FLOAT_FILL)
-
-        wse = dataset.createVariable("wse", "f8", ("nx", "nt"), fill_value = self.FLOAT_FILL)
-        wse.long_name = "water surface elevation with respect to the geoid"
-        wse.units = "m"
-        wse.valid_min = -1000
-        wse.valid_max = 100000
-        wse.comment = "Fitted node water surface elevation, relative to the " \
-            + "provided model of the geoid (geoid_hght), with all " \
-            + "corrections for media delays (wet and dry troposphere, and " \
-            +" ionosphere), crossover correction, and tidal effects " \
-            + "(solid_tide, load_tidef, and pole_tide) applied."
-        wse[:] = np.nan_to_num(data["node"]["wse"], copy=True, nan=self.FLOAT_FILL)
+    def __fill_value(self, datatype):
+        """Return fill value of NetCDF variables of datatype.
+
+        Parameters
+        ----------
+        datatype: str
+            NetCDF data type of variable
+
+        Returns
+        -------
+        float, int or str
+        """
+
+        return { "f4": self.FLOAT_FILL, "f8": self.FLOAT_FILL, 
+            "i1": self.FLAG_FILL, "i4": self.INT_FILL, "u1": self.COUNT_FILL,
+            "S1": self.STR_FILL }[datatype]
+
+    def __find_empty(self, arrays, names):
+        """Return names of variables that only hold missing values.
         
-        wse_u = dataset.createVariable("wse_u", "f8", ("nx", "nt"), fill_value = self.FLOAT_FILL)
-        wse_u.long_name = "total uncertainty in the water surface elevation"
-        wse_u.units = "m"
-        wse_u.valid_min = 0.0
-        wse_u.valid_max = 999999
-        wse_u.comment = "Total one-sigma uncertainty (random and systematic) " \
-            + "in the node WSE, including uncertainties of corrections, and " \
-            + "variation about the fit."
-        wse_u[:] = np.nan_to_num(data["node"]["wse_u"], copy=True, nan=self.FLOAT_FILL)
-
-        node_q = dataset.createVariable("node_q", "i4", ("nx", "nt"), 
-            fill_value=self.INT_FILL)
-        node_q.long_name = "summary quality indicator for the node"
-        node_q.standard_name = "status_flag"
-        node_q.short_name = "node_qual"
-        node_q.flag_meanings = "good suspect degraded bad"
-        node_q.flag_values = "0 1 2 3"
-        node_q.valid_min = 0
-        node_q.valid_max = 3
-        node_q.comment = "Summary quality indicator for the node " \
-            + "measurement. Value of 0 indicates a nominal measurement, 1 " \
-            + "indicates a suspect measurement, 2 indicates a degraded " \
-                + "quality measurement, and 3 indicates a bad measurement."
-        node_q[:] = np.nan_to_num(data["node"]["node_q"], copy=True, nan=self.INT_FILL)
-
-        dark_frac = dataset.createVariable("dark_frac", "f8", ("nx", "nt"),
-            fill_value=self.FLOAT_FILL)
-        dark_frac.long_name = "fractional area of dark water"
-        dark_frac.units = "1"
-        dark_frac.valid_min = 0
-        dark_frac.valid_max = 1
-        dark_frac.comment = "Fraction of node area_total covered by dark water."
-        dark_frac[:] = np.nan_to_num(data["node"]["dark_frac"], copy=True, nan=self.FLOAT_FILL)
-
-        ice_clim_f = dataset.createVariable("ice_clim_f", "i4", ("nx", "nt"),
-            fill_value=self.INT_FILL)
-        ice_clim_f.long_name = "climatological ice cover flag"
-        ice_clim_f.standard_name = "status_flag"
-        ice_clim_f.source = "Yang et al. (2020)"
-        ice_clim_f.flag_meanings = "no_ice_cover uncertain_ice_cover full_ice_cover"
-        ice_clim_f.flag_values = "0 1 2"
-        ice_clim_f.valid_min = 0
-        ice_clim_f.valid_max = 2
-        ice_clim_f.comment = "Climatological ice cover flag indicating " \
-            + "whether the node is ice-covered on the day of the " \
-            + "observation based on external climatological information " \
-            + "(not the SWOT measurement). Values of 0, 1, and 2 indicate " \
-            + "that the node is likely not ice covered, may or may not be " \
-            + "partially or fully ice covered, and likely fully ice covered, " \
-            + "respectively."
-        ice_clim_f[:] = np.nan_to_num(data["node"]["ice_clim_f"], copy=True, nan=self.INT_FILL)
-
-        ice_dyn_f = dataset.createVariable("ice_dyn_f", "i4", ("nx", "nt"),
-            fill_value=self.INT_FILL)
-        ice_dyn_f.long_name = "dynamical ice cover flag"
-        ice_dyn_f.standard_name = "status_flag"
-        ice_dyn_f.source = "Yang et al. (2020)"
-        ice_dyn_f.flag_meanings = "no_ice_cover uncertain_ice_cover full_ice_cover"
-        ice_dyn_f.flag_values = "0 1 2"
-        ice_dyn_f.valid_min = 0
-        ice_dyn_f.valid_max = 2
-        ice_dyn_f.comment = "Dynamic ice cover flag indicating whether " \
-            + "the surface is ice-covered on the day of the observation " \
-            + "based on analysis of external satellite optical data. Values " \
-            + "of 0, 1, and 2 indicate that the node is not ice covered, " \
-            + "partially ice covered, and fully ice covered, respectively."
-        ice_dyn_f[:] = np.nan_to_num(data["node"]["ice_dyn_f"], copy=True, nan=self.INT_FILL)
-
-        node_q_b = dataset.createVariable("node_q_b", "i4", ("nx", "nt"),
-            fill_value=self.INT_FILL)
-        node_q_b.long_name = "bitwise quality indicator for the node"
-        node_q_b.standard_name = "status_flag"
-        node_q_b.short_name = "node_qual_bitwise"
-        node_q_b.flag_meanings = "sig0_qual_suspect classification_qual_suspect geolocation_qual_suspect water_fraction_suspect blocking_width_suspect bright_land few_sig0_observations few_area_observations few_wse_observations far_range_suspect near_range_suspect classification_qual_degraded geolocation_qual_degraded wse_outlier wse_bad no_sig0_observations no_area_observations no_wse_observations no_observations"
-        node_q_b.flag_masks = "1 2 4 8 16 128 512 1024 2048 8192 16384 262144 524288 8388608 16777216 33554432 67108864 134217728 268435456"
-        node_q_b.valid_min = 0
-        node_q_b.valid_max = 529297055
-        node_q_b.comment = "Bitwise quality indicator for the node " \
-            + "measurement. If this word is interpreted as an unsigned " \
-            + "integer, a value of 0 indicates good data, values greater " \
-            + "than 0 but less than 262144 represent suspect data, values " \
-            + "greater than or equal to 262144 but less than 8388608 " \
-            + "represent degraded data, and values greater than or equal to " \
-            + "8388608 represent bad data."
-        node_q_b[:] = np.nan_to_num(data["node"]["node_q_b"], copy=True, nan=self.INT_FILL)
-
-        n_good_pix = dataset.createVariable("n_good_pix", "i4", ("nx", "nt"),
-            fill_value = self.INT_FILL)
-        n_good_pix.long_name = "number of pixels that have a valid WSE"
-        n_good_pix.units = "1"
-        n_good_pix.valid_min = 0
-        n_good_pix.valid_max = 100000
-        n_good_pix.comment = "Number of pixels assigned to the node that " \
-            + "have a valid node WSE."
-        data["node"]["n_good_pix"][data["node"]["n_good_pix"] == -99999999] = self.INT_FILL    # sac-specific
-        n_good_pix[:] = np.nan_to_num(data["node"]["n_good_pix"], copy=True, nan=self.INT_FILL)
-
-        xovr_cal_q = dataset.createVariable("xovr_cal_q", "i4", ("nx", "nt"),
-            fill_value=self.INT_FILL)
-        xovr_cal_q.long_name = "quality of the cross-over calibration"
-        xovr_cal_q.flag_meanings = "good suspect bad"
-        xovr_cal_q.flag_values = "0 1 2"
-        xovr_cal_q.valid_min = 0
-        xovr_cal_q.valid_max = 2
-        xovr_cal_q.comment = "Quality of the cross-over calibration. A value " \
-            + "of 0 indicates a nominal measurement, 1 indicates a suspect " \
-            + "measurement, and 2 indicates a bad measurement."
-        xovr_cal_q[:] = np.nan_to_num(data["node"]["xovr_cal_q"], copy=True, nan=self.INT_FILL)  
-
-    def __write_reach_vars(self, dataset, data, reach_id):
+        Always empty when skip_empty is False so that every variable is 
+        written.
+
+        Parameters
+        ----------
+        arrays: dict
+            dictionary of SWOT data variables
+        names: list
+            list of variable names to check
+
+        Returns
+        -------
+        set of variable names
+        """
+
+        if not self.skip_empty:
+            return set()
+        empty = set()
+        for name in names:
+            sentinels = self.SAC_SENTINELS.get(name, ())
+            if arrays[name].dtype.kind != "f":
+                sentinels += (self.INT_FILL,)
+            if is_missing(arrays[name], sentinels):
+                empty.add(name)
+        return empty
+
+    def __write_reach_vars(self, dataset, data, reach_id, nt):
         """Create and write reach-level variables to NetCDF4 dataset.
         
         TODO:
@@ -371,254 +710,169 @@ class WriteRiver(WriteStrategy):
             dictionary of SWOT data variables
         reach_id: str
             unique reach identifier value
+        nt: int
+            chunk length for (nt,) variables
         """
 
-        reach_id_v = dataset.createVariable("reach_id", "i8")
-        reach_id_v.long_name = "reach ID from prior river database"
-        reach_id_v.comment = "Unique reach identifier from the prior river " \
-            + "database. The format of the identifier is CBBBBBRRRRT, where " \
-            + "C=continent, B=basin, R=reach, T=type."
-        reach_id_v.assignValue(int(reach_id))
-        
-        time = dataset.createVariable("time", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        time.long_name = "time (UTC)"
-        time.calendar = "gregorian"
-        time.tai_utc_difference = "[value of TAI-UTC at time of first record]"
-        time.leap_second = "YYYY-MM-DD hh:mm:ss"
-        time.units = "seconds since 2000-01-01 00:00:00.000"
-        time.comment = "Time of measurement in seconds in the UTC time " \
-            + "scale since 1 Jan 2000 00:00:00 UTC. [tai_utc_difference] is " \
-            + "the difference between TAI and UTC reference time (seconds) " \
-            + "for the first measurement of the data set. If a leap second " \
-            + "occurs within the data set, the metadata leap_second is set " \
-            + "to the UTC time at which the leap second occurs."
-        data["reach"]["time"][np.isclose(data["reach"]["time"], -999999999999)] = self.FLOAT_FILL    # sac-specific
-        time[:] = np.nan_to_num(data["reach"]["time"], copy=True, nan=self.FLOAT_FILL)
-        
+        self.__write_reach_id(dataset, reach_id)
+
         dataset.createDimension('chartime', 20)
-        time_str = dataset.createVariable("time_str", "S1", ("nt", "chartime"), 
-                                          fill_value=self.STR_FILL)
-        time_str.long_name = "UTC time"
-        time_str.standard_name = "time"
-        time_str.calendar = "gregorian"
-        time_str.tai_utc_difference = "[value of TAI-UTC at time of first record]"
-        time_str.leap_second = "YYYY-MM-DD hh:mm:ss"
-        time_str.comment = "Time string giving UTC time. The format is " \
-            + "YYYY-MM-DDThh:mm:ssZ, where the Z suffix indicates UTC time."
-        time_str[:] = stringtochar(data["reach"]["time_str"].astype("S20"))
-        
-        dxa = dataset.createVariable("d_x_area", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        dxa.long_name = "change in cross-sectional area"
-        dxa.units = "m^2"
-        dxa.valid_min = -10000000
-        dxa.valid_max = 10000000
-        dxa.comment = "Change in channel cross sectional area from the value " \
-            + "reported in the prior river database."
-        data["reach"]["d_x_area"][np.isclose(data["reach"]["d_x_area"], -1.e+12)] = np.nan    # sac-specific
-        dxa[:] = np.nan_to_num(data["reach"]["d_x_area"], copy=True, nan=self.FLOAT_FILL)
-
-        dxa_u = dataset.createVariable("d_x_area_u", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        dxa_u.long_name = "total uncertainty of the change in the cross-sectional area"
-        dxa_u.units = "m^2"
-        dxa_u.valid_min = 0
-        dxa_u.valid_max = 10000000    # TODO fix to match PDD
-        dxa_u.comment = "Total one-sigma uncertainty (random and systematic) " \
-            + "in the change in the cross-sectional area."
-        dxa_u[:] = np.nan_to_num(data["reach"]["d_x_area_u"], copy=True, nan=self.FLOAT_FILL)
-        
-        slope = dataset.createVariable("slope", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        slope.long_name = "water surface slope with respect to the geoid"
-        slope.units = "m/m"
-        slope.valid_min = -0.001
-        slope.valid_max = 0.1
-        slope.comment = "Fitted water surface slope relative to the geoid, " \
-            + "and with the same corrections and geophysical fields applied as " \
-            + "wse. The units are m/m. The upstream or downstream direction " \
-            + "is defined by the prior river database. A positive slope " \
-            + "means that the downstream WSE is lower."
-        slope[:] = np.nan_to_num(data["reach"]["slope"], copy=True, nan=self.FLOAT_FILL)
-
-        slope_u = dataset.createVariable("slope_u", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        slope_u.long_name = "total uncertainty in the water surface slope"
-        slope_u.units = "m/m"
-        slope_u.valid_min = 0
-        slope_u.valid_max = 0.1
-        slope_u.comment = "Total one-sigma uncertainty (random and " \
-            + "systematic) in the water surface slope, including " \
-            + "uncertainties of corrections and variation about the fit."
-        slope_u[:] = np.nan_to_num(data["reach"]["slope_u"], copy=True, nan=self.FLOAT_FILL)
-
-        slope2 = dataset.createVariable("slope2", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        slope2.long_name = "enhanced water surface slope with respect to geoid"
-        slope2.units = "m/m"
-        slope2.valid_min = -0.001
-        slope2.valid_max = 0.1
-        slope2.comment = "Enhanced water surface slope relative to the " \
-            + "geoid, produced using a smoothing of the node wse. The " \
-            + "upstream or downstream direction is defined by the prior " \
-            + "river database. A positive slope means that the downstream " \
-            + "WSE is lower."
-        slope2[:] = np.nan_to_num(data["reach"]["slope2"], copy=True, nan=self.FLOAT_FILL)
-
-        slope2_u = dataset.createVariable("slope2_u", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        slope2_u.long_name = "uncertainty in the enhanced water surface slope"
-        slope2_u.units = "m/m"
-        slope2_u.valid_min = 0
-        slope2_u.valid_max = 0.1
-        slope2_u.comment = "Total one-sigma uncertainty (random and " \
-            + "systematic) in the enhanced water surface slope, including " \
-            + "uncertainties of corrections and variation about the fit."
-        slope2_u[:] = np.nan_to_num(data["reach"]["slope2_u"], copy=True, nan=self.FLOAT_FILL)
-        
-        width = dataset.createVariable("width", "f8", ("nt",), 
-            fill_value=self.FLOAT_FILL)
-        width.long_name = "reach width"
-        width.units = "m"
-        width.valid_min = 0.0
-        width.valid_max = 100000
-        width.comment = "Reach width."
-        width[:] = np.nan_to_num(data["reach"]["width"], copy=True, nan=self.FLOAT_FILL)
-
-        width_u = dataset.createVariable("width_u", "f8", ("nt",), 
-            fill_value=self.FLOAT_FILL)
-        width_u.long_name = "total uncertainty in the reach width"
-        width_u.units = "m"
-        width_u.valid_min = 0
-        width_u.valid_max = 100000
-        width_u.comment = "Total one-sigma uncertainty (random and systematic) in the reach width."
-        width_u[:] = np.nan_to_num(data["reach"]["width_u"], copy=True, nan=self.FLOAT_FILL)
-
-        wse = dataset.createVariable("wse", "f8", ("nt",), fill_value=self.FLOAT_FILL)
-        wse.long_name = "water surface elevation with respect to the geoid"
-        wse.units = "m"
-        wse.valid_min = -1500
-        wse.valid_max = 150000
-        wse.comment = "Fitted reach water surface elevation, relative to the " \
-            + "provided model of the geoid (geoid_hght), with corrections " \
-            + "for media delays (wet and dry troposphere, and ionosphere), " \
-            + "crossover correction, and tidal effects (solid_tide, " \
-            + "load_tidef, and pole_tide) applied."
-        wse[:] = np.nan_to_num(data["reach"]["wse"], copy=True, nan=self.FLOAT_FILL)
-
-        wse_u = dataset.createVariable("wse_u", "f8", ("nt",), fill_value=self.FLOAT_FILL)
-        wse_u.long_name = "total uncertainty in the water surface elevation"
-        wse_u.units = "m"
-        wse_u.valid_min = 0.0
-        wse_u.valid_max = 999999
-        wse_u.comment = "Total one-sigma uncertainty (random and systematic) " \
-            + "in the reach WSE, including uncertainties of corrections, and " \
-            + "variation about the fit."
-        wse_u[:] = np.nan_to_num(data["reach"]["wse_u"], copy=True, nan=self.FLOAT_FILL)
-
-        reach_q = dataset.createVariable("reach_q", "i4", ("nt",),
-            fill_value=self.INT_FILL)
-        reach_q.long_name = "summary quality indicator for the reach"
-        reach_q.standard_name = "summary quality indicator for the reach"
-        reach_q.flag_meanings = "good suspect degraded bad"
-        reach_q.flag_values = "0 1 2 3"
-        reach_q.valid_min = 0
-        reach_q.valid_max = 3
-        reach_q.comment = "Summary quality indicator for the reach " \
-            + "measurement. A value of 0 indicates a nominal measurement, 1 " \
-            + "indicates a suspect measurement, 2 indicates a degraded " \
-            + "measurement, and 3 indicates a bad measurement."
-        reach_q[:] = np.nan_to_num(data["reach"]["reach_q"], copy=True, nan=self.INT_FILL)
-
-        dark_frac = dataset.createVariable("dark_frac", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        dark_frac.long_name = "fractional area of dark water"
-        dark_frac.units = "1"
-        dark_frac.valid_min = -1000
-        dark_frac.valid_max = 10000
-        dark_frac.comment = "Fraction of reach area_total covered by dark water."
-        dark_frac[:] = np.nan_to_num(data["reach"]["dark_frac"], copy=True, nan=self.FLOAT_FILL)
-
-        ice_clim_f = dataset.createVariable("ice_clim_f", "i4", ("nt",),
-            fill_value=self.INT_FILL)
-        ice_clim_f.long_name = "climatological ice cover flag"
-        ice_clim_f.standard_name = "status_flag"
-        ice_clim_f.source = "Yang et al. (2020)"
-        ice_clim_f.flag_meanings = "no_ice_cover uncertain_ice_cover full_ice_cover"
-        ice_clim_f.flag_values = "0 1 2"
-        ice_clim_f.valid_min = 0
-        ice_clim_f.valid_max = 2
-        ice_clim_f.comment = "Climatological ice cover flag indicating " \
-            + "whether the reach is ice-covered on the day of the " \
-            + "observation based on external climatological information " \
-            + "(not the SWOT measurement). Values of 0, 1, and 2 indicate " \
-            + "that the reach is likely not ice covered, may or may not be " \
-            + "partially or fully ice covered, and likely fully ice covered, " \
-            + "respectively."
-        ice_clim_f[:] = np.nan_to_num(data["reach"]["ice_clim_f"], copy=True, nan=self.INT_FILL)
-
-        ice_dyn_f = dataset.createVariable("ice_dyn_f", "i4", ("nt",),
-            fill_value=self.INT_FILL)
-        ice_dyn_f.long_name = "dynamical ice cover flag"
-        ice_dyn_f.standard_name = "status_flag"
-        ice_dyn_f.source = "Yang et al. (2020)"
-        ice_dyn_f.flag_meanings = "no_ice_cover uncertain_ice_cover full_ice_cover"
-        ice_dyn_f.flag_values = "0 1 2"
-        ice_dyn_f.valid_min = 0
-        ice_dyn_f.valid_max = 2
-        ice_dyn_f.comment = "Dynamic ice cover flag indicating whether " \
-            + "the surface is ice-covered on the day of the observation " \
-            + "based on analysis of external satellite optical data. Values " \
-            + "of 0, 1, and 2 indicate that the reach is not ice covered, " \
-            + "partially ice covered, and fully ice covered, respectively."
-        ice_dyn_f[:] = np.nan_to_num(data["reach"]["ice_dyn_f"], copy=True, nan=self.INT_FILL)
-
-        partial_f = dataset.createVariable("partial_f", "i4", ("nt",),
-            fill_value=self.INT_FILL)
-        partial_f.long_name = "partial reach coverage flag"
-        partial_f.standard_name = "status_flag"
-        partial_f.flag_meanings = "covered not_covered"
-        partial_f.flag_values = "0 1"
-        partial_f.valid_min = 0
-        partial_f.valid_max = 1
-        partial_f.comment = "Flag that indicates only partial reach " \
-            + "coverage. The flag is 0 if at least half the nodes of the " \
-            + "reach have valid WSE measurements; the flag is 1 otherwise " \
-            + "and reach-level quantities are not computed."
-        partial_f[:] = np.nan_to_num(data["reach"]["partial_f"], copy=True, nan=self.INT_FILL)
-
-        n_good_nod = dataset.createVariable("n_good_nod", "i4", ("nt",),
-            fill_value=self.INT_FILL)
-        n_good_nod.long_name = "number of nodes in the reach that have a " \
-            + "valid WSE"
-        n_good_nod.units = "1"
-        n_good_nod.valid_min = 0
-        n_good_nod.valid_max = 100
-        n_good_nod.comment = "Number of nodes in the reach that have " \
-            + "a valid node WSE. Note that the total number of nodes " \
-            + "from the prior river database is given by p_n_nodes."
-        n_good_nod[:] = np.nan_to_num(data["reach"]["n_good_nod"], copy=True, nan=self.INT_FILL)
-
-        obs_frac_n = dataset.createVariable("obs_frac_n", "f8", ("nt",),
-            fill_value=self.FLOAT_FILL)
-        obs_frac_n.long_name = "fraction of nodes that have a valid WSE"
-        obs_frac_n.units = "1"
-        obs_frac_n.valid_min = 0
-        obs_frac_n.valid_max = 1
-        obs_frac_n.comment = "Fraction of nodes (n_good_nod/p_n_nodes) " \
-            + "in the reach that have a valid node WSE. The value is " \
-            + "between 0 and 1."
-        obs_frac_n[:] = np.nan_to_num(data["reach"]["obs_frac_n"], copy=True, nan=self.INT_FILL)
-
-        xovr_cal_q = dataset.createVariable("xovr_cal_q", "i4", ("nt",),
-            fill_value=self.INT_FILL)
-        xovr_cal_q.long_name = "quality of the cross-over calibration"
-        xovr_cal_q.flag_meanings = "good suspect bad"
-        xovr_cal_q.flag_values = "0 1 2"
-        xovr_cal_q.valid_min = 0
-        xovr_cal_q.valid_max = 2
-        xovr_cal_q.comment = "Quality of the cross-over calibration. A value " \
-            + "of 0 indicates a nominal measurement, 1 indicates a suspect " \
-            + "measurement, and 2 indicates a bad measurement."
-        xovr_cal_q[:] = np.nan_to_num(data["reach"]["xovr_cal_q"], copy=True, nan=self.INT_FILL)
\ No newline at end of file
+        for name, datatype, dimensions in self.REACH_VARS:
+            # Short variables stay contiguous as a chunk index outweighs any 
+            # compression gain
+            chunksizes = (nt, 20)[:len(dimensions)]
+            if np.prod(chunksizes) * np.dtype(datatype).itemsize >= self.MIN_REACH_COMPRESS:
+                layout = { "chunksizes": chunksizes, **self.REACH_COMPRESSION }
+            else:
+                layout = { "contiguous": True }
+            variable = dataset.createVariable(name, datatype, dimensions,
+                fill_value=self.__fill_value(datatype), **layout,
+                least_significant_digit=self.LEAST_SIGNIFICANT_DIGIT.get(name))
+            set_attributes(variable, REACH_ATTRS[name])
+
+        # Write data once every variable has been defined, arrays are already 
+        # filled so skip masked array conversion
+        dataset.set_auto_maskandscale(False)
+        reach = data["reach"]
+        for name in ("time", "d_x_area"):    # sac-specific
+            dataset[name][:] = replace_sentinels(reach[name], self.SAC_SENTINELS[name], self.FLOAT_FILL)
+        dataset["time_str"][:] = to_char_array(reach["time_str"], 20)
+        dataset["n_good_nod"][:] = fill_counts(reach["n_good_nod"], self.INT_FILL, self.COUNT_FILL)
+        for name, datatype, _ in self.REACH_VARS:
+            if datatype in ("f4", "f8", "i4") and name not in self.SAC_SENTINELS:
+                # obs_frac_n has always replaced missing values with INT_FILL
+                fill = self.INT_FILL if name == "obs_frac_n" else self.__fill_value(datatype)
+                dataset[name][:] = fill_missing(reach[name], fill, np.dtype(datatype))
+        flags = fill_flags([reach[name] for name in self.REACH_FLAGS], self.INT_FILL, self.FLAG_FILL)
+        for name, values in zip(self.REACH_FLAGS, flags):
+            dataset[name][:] = values
+
+def replace_sentinels(array, sentinels, fill):
+    """Replace sentinel and NaN values in array with fill in a single pass.
+    
+    The returned array needs no further NaN replacement. Arrays whose minimum
+    is above every sentinel hold neither sentinels nor NaN and are returned
+    after a single reduction without allocating a mask.
+    
+    Parameters
+    ----------
+    array: numpy.ndarray
+        array of variable data, modified in place
+    sentinels: tuple
+        values that indicate missing data
+    fill: float or int
+        value to replace sentinel values with
+
+    Returns
+    -------
+    numpy.ndarray of cleaned variable data
+    """
+
+    if array.size and array.min() > max(sentinels):
+        return array
+    mask = np.isin(array, sentinels)
+    if array.dtype.kind == "f":
+        mask |= np.isnan(array)
+    np.putmask(array, mask, fill)
+    return array
+
+def is_missing(array, sentinels):
+    """Return True if array only holds sentinel or NaN values.
+    
+    The first element is checked before the whole array so that arrays with
+    valid data are usually rejected without a full scan.
+    
+    Parameters
+    ----------
+    array: numpy.ndarray
+        array of variable data
+    sentinels: tuple
+        values that indicate missing data
+
+    Returns
+    -------
+    bool
+    """
+
+    for values in (array.ravel()[:1], array):
+        mask = np.isin(values, sentinels)
+        if values.dtype.kind == "f":
+            mask |= np.isnan(values)
+        if not mask.all():
+            return False
+    return True
+
+def fill_flags(arrays, int_fill, flag_fill):
+    """Stack flag arrays, replace missing values and cast to int8 in one pass.
+    
+    Parameters
+    ----------
+    arrays: list
+        list of numpy.ndarray flag arrays of the same shape
+    int_fill: int
+        integer fill value used for missing data during extraction
+    flag_fill: int
+        fill value of the int8 NetCDF variables
+
+    Returns
+    -------
+    numpy.ndarray of int8 flags with one row per input array
+    """
+
+    flags = np.stack(arrays)
+    replace_sentinels(flags, (int_fill,), flag_fill)
+    return flags.astype(np.int8, copy=False)
+
+def fill_counts(array, int_fill, count_fill):
+    """Replace missing and out of range counts and cast to uint8.
+    
+    Counts below zero or above count_fill would wrap around when cast so they
+    are stored as missing. Arrays are modified in place.
+    
+    Parameters
+    ----------
+    array: numpy.ndarray
+        array of counts
+    int_fill: int
+        integer fill value used for missing data during extraction
+    count_fill: int
+        fill value of the uint8 NetCDF variable
+
+    Returns
+    -------
+    numpy.ndarray of uint8 counts
+    """
+
+    counts = replace_sentinels(array, (int_fill,), count_fill)
+    np.putmask(counts, (counts < 0) | (counts > count_fill), count_fill)
+    return counts.astype(np.uint8)
+
+def fill_missing(array, fill, dtype, out=None):
+    """Replace NaN values in array with fill and cast to dtype.
+    
+    The array is only scanned for missing values when its sum is not finite
+    so that clean arrays are written without an extra copy. Integer targets
+    only need NaN replaced so a single masked copy is used for them. Arrays
+    are modified in place.
+    
+    Parameters
+    ----------
+    array: numpy.ndarray
+        array of variable data
+    fill: float or int
+        value to replace NaN values with
+    dtype: numpy.dtype
+        data type of the NetCDF variable
+    out: numpy.ndarray, optional
+        scratch buffer of dtype to cast into instead of allocating a new array
+    """
+
+    if array.dtype.kind == "f" and not np.isfinite(array.sum()):
+        if np.dtype(dtype).kind == "i":
+            np.copyto(array, fill, where=np.isnan(array))
+        else:
+            array = np.nan_to_num(array, copy=False, nan=fill)
+    if out is not None and array.dtype != out.dtype:
+        np.copyto(out, array, casting="unsafe")
+        return out
+    return array.astype(dtype, copy=False)
@@ -6,6 +6,31 @@ from datetime import datetime
 from netCDF4 import Dataset
 import numpy as np
 
+# NetCDF variable attributes for the time step coordinate variable
+NT_ATTRS = {
+    "units": "pass",
+    "long_name": "time steps",
+}
+
+# NetCDF variable attributes for time strings shared by all writers
+TIME_STR_ATTRS = {
+    "long_name": "UTC time",
+    "standard_name": "time",
+    "calendar": "gregorian",
+    "tai_utc_difference": "[value of TAI-UTC at time of first record]",
+    "leap_second": "YYYY-MM-DD hh:mm:ss",
+    "comment": "Time string giving UTC time. The format is "
+        + "YYYY-MM-DDThh:mm:ssZ, where the Z suffix indicates UTC time.",
+}
+
+# NetCDF variable attributes for the global observation variable
+OBS_ATTRS = {
+    "units": "pass",
+    "long_name": "pass number that indicates cycle/pass observations",
+    "comment": "A list of pass numbers that identify each reach and "
+        + "node observation.",
+}
+
 class WriteStrategy:
     """A class that takes SWOT and SoS data and writes intermediate input data.
     
@@ -109,10 +134,7 @@ class WriteStrategy:
         """
         
         obs = dataset.createVariable("observations", "i4", ("nt",))
-        obs.units = "pass"
-        obs.long_name = "pass number that indicates cycle/pass observations"
-        obs.comment = "A list of pass numbers that identify each reach and " \
-            + "node observation."
+        set_attributes(obs, OBS_ATTRS)
         obs[:] = np.array(obs_times, dtype=np.int32)
     
     @abstractmethod
@@ -143,18 +165,55 @@ class WriteStrategy:
             list of string cycle/pass identifiers
         """
 
-        # NetCDF4 dataset
+        # NetCDF4 dataset, built in memory and written to disk once on close
         swot_file = self.output_dir / f"{self.swot_id}_SWOT.nc"
-        dataset = Dataset(swot_file, 'w', format="NETCDF4")
-        self.define_global_attrs(dataset)
+        with Dataset(swot_file, 'w', format="NETCDF4", diskless=True, 
+                     persist=True) as dataset:
+            # Variables are written in full so skip prefilling with fill values,
+            # writers enable prefill for any variable they leave unwritten
+            dataset.set_fill_off()
+            self.define_global_attrs(dataset)
+
+            # Dimension and data
+            self.create_dimensions(dataset, obs_times)
+            
+            # Global observation variable
+            self.define_global_obs(dataset, obs_times)
+
+            # Reach and node data
+            self.write_data(dataset, data)
+
+def set_attributes(variable, attributes):
+    """Set all NetCDF attributes on variable in a single call.
+    
+    Valid range attributes are cast to the variable data type as netCDF4
+    does when they are assigned individually.
+    
+    Parameters
+    ----------
+    variable: netCDF4.Variable
+        variable to set attributes on
+    attributes: dict
+        dictionary of attribute names (keys) and values (values)
+    """
 
-        # Dimension and data
-        self.create_dimensions(dataset, obs_times)
-        
-        # Global observation variable
-        self.define_global_obs(dataset, obs_times)
+    variable.setncatts({ name: np.array(value, dtype=variable.dtype) 
+                        if name in ("valid_min", "valid_max") else value 
+                        for name, value in attributes.items() })
 
-        # Reach and node data
-        self.write_data(dataset, data)
+def to_char_array(strings, width):
+    """Convert an array of strings to a character array for NetCDF.
+    
+    Strings are stored as fixed-width bytes and viewed as single characters
+    so no per-element conversion takes place.
+    
+    Parameters
+    ----------
+    strings: numpy.ndarray
+        array of strings
+    width: int
+        length of the character dimension
+    """
 
-        dataset.close()
\ No newline at end of file
+    chars = np.ascontiguousarray(strings, dtype=f"S{width}")
+    return chars.view("S1").reshape(chars.shape + (width,))
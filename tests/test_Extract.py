@@ -1,15 +1,21 @@
 # Standard imports
+from contextlib import redirect_stdout
+import io
 import os
 import re
 from pathlib import Path
+import struct
 import unittest
+import zipfile
 
 # Third-party imports
 import numpy as np
 from numpy.testing import assert_array_equal, assert_array_almost_equal
+import pandas as pd
+import shapefile
 
 # Local imports
-from input.extract.ExtractRiver import ExtractRiver, calculate_d_x_a
+from input.extract.ExtractRiver import ExtractRiver, calculate_d_x_a, create_node_dict
 from input.extract.ExtractLake import ExtractLake
 
 class TestExtract(unittest.TestCase):
@@ -22,6 +28,16 @@ class TestExtract(unittest.TestCase):
     LAKE_PARENT = Path(__file__).parent / "test_data" / "lake"
     LAKE_CYCLE_PASS = { "1_1001": 1, "1_1008": 2, "1_1015": 3, "1_1022": 4, "1_1029": 5, "1_1105": 6, "1_1112": 7, "1_1119": 8, "1_1126": 9, "1_1203": 10 }
     LAKE_ID = "7720003433"
+    DBF_FIELDS = [ ("name", "C", 10, 0), ("count", "N", 6, 0), ("value", "N", 10, 3), 
+                   ("day", "D", 8, 0), ("flag", "L", 1, 0) ]
+    DBF_RECORDS = [
+        b" " + b"abc       " + b"    12" + b"     1.500" + b"20230105" + b"T",
+        b" " + b"          " + b"   1.5" + b"          " + b"        " + b" ",    # blank
+        b"*" + b"deleted   " + b"     3" + b"     3.000" + b"20230106" + b"F",    # deleted
+        b" " + b"xyz       " + b"******" + b"  -2.25000" + b"00000000" + b"N",
+        b"D" + b"flagged   " + b"     4" + b"     4.000" + b"20230107" + b"Y",    # deleted
+        b" " + b"dat  x    " + b"   -7 " + b"  1e2     " + b"2023ABCD" + b"?",
+    ]
     
     def test_calculate_d_x_a(self):
         """Tests calculate_d_x_a function."""
@@ -95,6 +111,153 @@ class TestExtract(unittest.TestCase):
                 [ 216.322851, 216.415144, 216.400287, 216.758574, 216.507374 ] ]
         assert_array_almost_equal(expected, ext.data["node"]["wse"])
         
+    def test_extract_node_blank_and_missing(self):
+        """Tests extract_node method with blank values and a missing variable."""
+        
+        ext = ExtractRiver(self.REACH_ID, [], self.RIVER_CYCLE_PASS, None, None, self.NODE_LIST)
+        ext.data["node"] = create_node_dict(len(self.NODE_LIST), 2)
+        df = pd.DataFrame({
+            "node_id": self.NODE_LIST[:2],
+            "width": [100.5, None],
+            "width_u": [1.0, 2.0],
+            "wse": [216.3, 216.4],
+            "wse_u": [0.1, 0.2],
+            "dark_frac": [0.0, 0.5],
+            "time": [1.0, 2.0],
+            "node_q": [1, None],
+            "ice_clim_f": [0, 2],
+            "ice_dyn_f": [None, 1],
+            "node_q_b": [0, 8388608],
+            "n_good_pix": [10, 12],
+            "time_str": ["2023-01-01T00:00:00Z", "2023-01-01T00:00:01Z"]
+        }, dtype=object)
+        
+        # Blank values and the missing xovr_cal_q are stored as fill values
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertTrue(ext.extract_node(df, 1))
+        self.assertIn("xovr_cal_q", out.getvalue())
+        assert_array_equal([100.5, np.nan], ext.data["node"]["width"][:2,1])
+        assert_array_equal([1, -999], ext.data["node"]["node_q"][:2,1])
+        assert_array_equal([-999, 1], ext.data["node"]["ice_dyn_f"][:2,1])
+        assert_array_equal([0, 8388608], ext.data["node"]["node_q_b"][:2,1])
+        assert_array_equal([-999, -999], ext.data["node"]["xovr_cal_q"][:2,1])
+        assert_array_equal([-999] * 5, ext.data["node"]["node_q"][:,0])
+        
+    def test_extract_reach_blank_and_missing(self):
+        """Tests extract_reach method with blank values and a missing variable."""
+        
+        ext = ExtractRiver(self.REACH_ID, [], self.RIVER_CYCLE_PASS, None, None, self.NODE_LIST)
+        df = pd.DataFrame({
+            "reach_id": [self.REACH_ID, "74269900021"],
+            "width": [277.9, 300.0],
+            "reach_q": [1, 0],
+            "n_good_nod": [None, 3],
+            "time_str": ["2023-01-01T00:00:00Z", "2023-01-01T00:00:01Z"]
+        }, dtype=object)
+        
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertTrue(ext.extract_reach(df))
+        ext.stack_reach()
+        self.assertIn("partial_f", out.getvalue())
+        assert_array_equal([277.9], ext.data["reach"]["width"])
+        assert_array_equal([np.nan], ext.data["reach"]["wse"])
+        assert_array_equal([1], ext.data["reach"]["reach_q"])
+        assert_array_equal([-999], ext.data["reach"]["n_good_nod"])
+        assert_array_equal([-999], ext.data["reach"]["partial_f"])
+        self.assertEqual(np.int64, ext.data["reach"]["n_good_nod"].dtype)
+        
+    def test_extract_parallel(self):
+        """Tests extract_parallel bounds shapefiles in flight and refreshes credentials."""
+        
+        lake = ExtractLake(self.LAKE_ID, [], self.LAKE_CYCLE_PASS, None)
+        lake.creds = { "token": "expired" }
+        lake._creds_time = 0
+        lake.get_creds = lambda: { "token": "fresh" }
+        submitted = []
+        def get_dataframe(shpfile):
+            submitted.append((shpfile, lake.creds["token"]))
+            return shpfile
+        lake.get_dataframe = get_dataframe
+        
+        shapefiles = [ f"shapefile_{i}" for i in range(10) ]
+        results = []
+        for shpfile, df in lake.extract_parallel(shapefiles, max_workers=3):
+            self.assertLessEqual(len(submitted) - len(results), 3)
+            results.append((shpfile, df))
+        self.assertEqual([ (shp, shp) for shp in shapefiles ], results)
+        self.assertEqual({ "fresh" }, { token for _, token in submitted })
+        
+    def test_get_df(self):
+        """Tests get_df holds the same records as pyshp."""
+        
+        dbf_bytes = make_dbf(self.DBF_FIELDS, self.DBF_RECORDS)
+        lake = ExtractLake(self.LAKE_ID, [], self.LAKE_CYCLE_PASS, None)
+        df = lake.get_df(make_zip(dbf_bytes), "test.dbf")
+        
+        expected = shapefile.Reader(dbf=io.BytesIO(dbf_bytes)).records()
+        self.assertEqual([ f[0] for f in self.DBF_FIELDS ], list(df.columns))
+        self.assertEqual([ list(record) for record in expected ], df_records(df))
+        self.assertEqual(4, len(df.index))    # deleted records are dropped
+        self.assertEqual(np.float64, df["count"].dtype)
+        self.assertEqual(np.float64, df["value"].dtype)
+        self.assertEqual(object, df["flag"].dtype)
+        
+    def test_get_df_padded_records(self):
+        """Tests get_df reads records that are longer than their fields."""
+        
+        dbf_bytes = make_dbf(self.DBF_FIELDS, self.DBF_RECORDS, padding=3)
+        lake = ExtractLake(self.LAKE_ID, [], self.LAKE_CYCLE_PASS, None)
+        df = lake.get_df(make_zip(dbf_bytes), "test.dbf")
+        
+        expected = shapefile.Reader(dbf=io.BytesIO(dbf_bytes)).records()
+        self.assertEqual([ list(record) for record in expected ], df_records(df))
+        self.assertEqual(4, len(df.index))
+        
+    def test_get_df_integers(self):
+        """Tests get_df keeps integer fields as pandas infers them from pyshp records."""
+        
+        fields = [ ("name", "C", 10, 0), ("count", "N", 6, 0) ]
+        records = [ b" " + b"abc       " + b"    12", b" " + b"xyz\x00\x00\x00    " + b"    -7" ]
+        dbf_bytes = make_dbf(fields, records)
+        lake = ExtractLake(self.LAKE_ID, [], self.LAKE_CYCLE_PASS, None)
+        df = lake.get_df(make_zip(dbf_bytes), "test.dbf")
+        
+        records = shapefile.Reader(dbf=io.BytesIO(dbf_bytes)).records()
+        expected = pd.DataFrame(columns=[ f[0] for f in fields ], data=records)
+        pd.testing.assert_frame_equal(expected, df)
+        self.assertEqual(np.int64, df["count"].dtype)
+        self.assertEqual(["12", "-7"], df["count"].astype(str).tolist())
+        
+    def test_get_schema(self):
+        """Tests get_schema builds each set of field names and data types only once."""
+        
+        lake = ExtractLake(self.LAKE_ID, [], self.LAKE_CYCLE_PASS, None)
+        first = shapefile.Reader(dbf=io.BytesIO(make_dbf(self.DBF_FIELDS, self.DBF_RECORDS)))
+        second = shapefile.Reader(dbf=io.BytesIO(make_dbf(self.DBF_FIELDS, self.DBF_RECORDS[:2])))
+        other = shapefile.Reader(dbf=io.BytesIO(make_dbf(self.DBF_FIELDS[:2], 
+            [ record[:17] for record in self.DBF_RECORDS ])))
+        
+        fieldnames, dtypes = lake.get_schema(first.fields[1:])
+        self.assertIs(dtypes, lake.get_schema(second.fields[1:])[1])
+        self.assertEqual(1, len(lake._field_cache))
+        other_fieldnames, other_dtypes = lake.get_schema(other.fields[1:])
+        self.assertEqual(2, len(lake._field_cache))
+        
+        self.assertEqual(("name", "count", "value", "day", "flag"), fieldnames)
+        self.assertEqual((np.dtype(object), np.dtype(object), np.dtype(np.float64), 
+                          np.dtype(object), np.dtype(object)), dtypes)
+        self.assertEqual(("name", "count"), other_fieldnames)
+        self.assertEqual(dtypes[:2], other_dtypes)
+        
+    def test_get_df_invalid_text(self):
+        """Tests get_df raises on text that is not valid UTF-8 instead of replacing it."""
+        
+        # pyshp 2 raises UnicodeDecodeError and pyshp 3 wraps it in its own exception
+        records = [ b" " + b"ab\xff      " + b"     1" + b"     1.000" + b"20230105" + b"T" ]
+        lake = ExtractLake(self.LAKE_ID, [], self.LAKE_CYCLE_PASS, None)
+        with self.assertRaises(Exception):
+            lake.get_df(make_zip(make_dbf(self.DBF_FIELDS, records)), "test.dbf")
+        
     def test_extract_lake(self):
         """Tests extract method for lake data."""
         
@@ -121,4 +284,39 @@ class TestExtract(unittest.TestCase):
         return [ self.strtoi(shp) for shp in re.split(r'(\d+)', shapefile) ]
 
     def strtoi(self, text):
-        return int(text) if text.isdigit() else text
\ No newline at end of file
+        return int(text) if text.isdigit() else text
+
+def make_dbf(fields, records, padding=0):
+    """Return DBF file bytes for fields and raw records.
+    
+    Parameters
+    ----------
+    fields: list
+        list of (name, type, size, decimal) field descriptors
+    records: list
+        list of raw record bytes led by the deletion flag
+    padding: int
+        number of unused bytes appended to each record
+    """
+    
+    header_length = 32 + 32 * len(fields) + 1
+    record_length = 1 + sum(f[2] for f in fields) + padding
+    header = struct.pack("<B3BIHH20x", 3, 123, 1, 1, len(records), header_length, record_length)
+    descriptors = b"".join(struct.pack("<11sc4xBB14x", name.encode(), ftype.encode(), size, decimal)
+                           for name, ftype, size, decimal in fields)
+    body = b"".join(record + b" " * padding for record in records)
+    return header + descriptors + b"\r" + body + b"\x1a"
+
+def df_records(df):
+    """Return dataframe rows as lists with missing values as None like pyshp."""
+    
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+def make_zip(dbf_bytes, name="test.dbf"):
+    """Return in-memory zip file holding dbf_bytes."""
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr(name, dbf_bytes)
+    buffer.seek(0)
+    return buffer
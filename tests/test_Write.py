@@ -0,0 +1,266 @@
+# Standard imports
+from pathlib import Path
+import tempfile
+import unittest
+
+# Third-party imports
+from netCDF4 import Dataset
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+# Local imports
+from input.extract.ExtractRiver import create_node_dict
+from input.write.WriteRiver import WriteRiver, fill_counts, fill_flags, fill_missing, is_missing
+from input.write.WriteStrategy import set_attributes, to_char_array
+
+class TestWrite(unittest.TestCase):
+    """Tests methods and functions from Write module."""
+
+    REACH_ID = "74269900011"
+    NODE_LIST = ["74269900010011", "74269900010021", "74269900010031"]
+    OBS_TIMES = [1, 2, 3, 4]
+
+    def create_river_data(self):
+        """Return a small river data dictionary with missing and sentinel values."""
+
+        nx, nt = len(self.NODE_LIST), len(self.OBS_TIMES)
+        node = create_node_dict(nx, nt)
+        node["time_str"][:] = [[f"2023-01-0{t + 1}T00:00:00Z".encode() for t in range(nt)]] * nx
+        node["time"][:] = np.arange(nx * nt).reshape(nx, nt) + 7.e8
+        node["time"][0, 0] = -999999999999
+        node["d_x_area"][:] = 10.
+        node["d_x_area"][1, 1] = -1.e+12
+        node["width"][:] = 80.5
+        node["width"][2, 3] = np.nan
+        node["n_good_pix"][:] = 12
+        node["n_good_pix"][2, 2] = -99999999
+        node["node_q"][:] = 1
+        node["node_q"][0, 1] = -999
+        # wse, slope and ice_dyn_f are left empty
+
+        reach = { name: np.full(nt, 1.5) for name, datatype, _
+                 in WriteRiver.REACH_VARS if datatype != "S1" }
+        reach["time_str"] = np.array([f"2023-01-0{t + 1}T00:00:00Z" for t in range(nt)],
+                                     dtype=object)
+        reach["time"][0] = -999999999999
+        reach["d_x_area"][1] = -1.e+12
+        reach["width"][2] = np.nan
+        reach["reach_q"][:] = 2
+        reach["reach_q"][3] = -999
+        reach["n_good_nod"][:] = 3
+        reach["n_good_nod"][0] = np.nan
+        return { "reach": reach, "node": node }
+
+    def test_fill_counts(self):
+        """Tests fill_counts function."""
+
+        counts = np.array([np.nan, -999, 300, -2, 255, 0, 12], dtype=np.float64)
+        filled = fill_counts(counts, WriteRiver.INT_FILL, WriteRiver.COUNT_FILL)
+        self.assertEqual(np.uint8, filled.dtype)
+        assert_array_equal([255, 255, 255, 255, 255, 0, 12], filled)
+
+    def test_fill_flags(self):
+        """Tests fill_flags function."""
+
+        node_q = np.array([[0, 1], [-999, 3]])
+        ice_clim_f = np.array([[2, -999], [1, 0]])
+        flags = fill_flags([node_q, ice_clim_f], WriteRiver.INT_FILL, WriteRiver.FLAG_FILL)
+        self.assertEqual(np.int8, flags.dtype)
+        assert_array_equal([[[0, 1], [-1, 3]], [[2, -1], [1, 0]]], flags)
+
+        reach_q = np.array([1., np.nan, -999])
+        flags = fill_flags([reach_q, np.zeros(3)], WriteRiver.INT_FILL, WriteRiver.FLAG_FILL)
+        assert_array_equal([[1, -1, -1], [0, 0, 0]], flags)
+
+    def test_fill_missing(self):
+        """Tests fill_missing function on clean, NaN and infinite values."""
+
+        fill = WriteRiver.FLOAT_FILL
+
+        # Clean arrays are returned without a copy
+        clean = np.array([[1.5, 2.5], [3.5, 4.5]])
+        self.assertIs(clean, fill_missing(clean, fill, np.dtype("f8")))
+        assert_array_equal([[1.5, 2.5], [3.5, 4.5]], clean)
+
+        # NaN is replaced with fill for float and integer variables
+        filled = fill_missing(np.array([1.5, np.nan, 3.]), fill, np.dtype("f8"))
+        assert_array_equal([1.5, fill, 3.], filled)
+        filled = fill_missing(np.array([1., np.nan, 3.]), WriteRiver.INT_FILL, np.int32)
+        self.assertEqual(np.int32, filled.dtype)
+        assert_array_equal([1, WriteRiver.INT_FILL, 3], filled)
+
+        # Infinite values are clipped to the largest finite values
+        filled = fill_missing(np.array([np.inf, np.nan, -np.inf, 2.]), fill, np.dtype("f8"))
+        finfo = np.finfo(np.float64)
+        assert_array_equal([finfo.max, fill, finfo.min, 2.], filled)
+
+    def test_fill_missing_scratch(self):
+        """Tests fill_missing reuses the scratch buffer between variables."""
+
+        scratch = np.empty((2, 2), dtype=np.float32)
+        width = np.array([[np.nan, 80.5], [81.5, np.nan]])
+        filled = fill_missing(width, WriteRiver.FLOAT_FILL, np.dtype("f4"), scratch)
+        self.assertIs(scratch, filled)
+        assert_array_equal(np.array([[WriteRiver.FLOAT_FILL, 80.5], [81.5, WriteRiver.FLOAT_FILL]], 
+                                    dtype=np.float32), filled)
+
+        # The next variable overwrites the whole buffer, fills do not carry over
+        dark_frac = np.array([[0.25, 0.5], [0.75, 1.]])
+        filled = fill_missing(dark_frac, WriteRiver.FLOAT_FILL, np.dtype("f4"), scratch)
+        self.assertIs(scratch, filled)
+        assert_array_equal(np.array([[0.25, 0.5], [0.75, 1.]], dtype=np.float32), filled)
+        assert_array_equal([[0.25, 0.5], [0.75, 1.]], dark_frac)
+
+    def test_is_missing(self):
+        """Tests is_missing function."""
+
+        self.assertTrue(is_missing(np.full((2, 3), np.nan), ()))
+        self.assertTrue(is_missing(np.array([np.nan, -1.e+12, -999999999999]), (-1.e+12, -999999999999)))
+        self.assertTrue(is_missing(np.full(4, -999), (-999,)))
+        self.assertFalse(is_missing(np.array([np.nan, 2.5]), ()))
+        self.assertFalse(is_missing(np.array([1, -999]), (-999,)))
+        self.assertFalse(is_missing(np.array([-999, -999, 0]), (-999,)))
+
+    def test_write_river_slopes(self):
+        """Tests small slopes are written without losing relative precision."""
+
+        slopes = np.array([1.e-5, 3.2e-7, 2.5e-4, 1.e-3])
+        data = self.create_river_data()
+        for name in ("slope", "slope_u", "slope2", "slope2_u"):
+            data["node"][name][:] = slopes
+            data["reach"][name][:] = slopes
+        with tempfile.TemporaryDirectory() as output_dir:
+            WriteRiver(self.REACH_ID, Path(output_dir), self.NODE_LIST).write(data, self.OBS_TIMES)
+            with Dataset(Path(output_dir) / f"{self.REACH_ID}_SWOT.nc") as dataset:
+                for group in ("node", "reach"):
+                    for name in ("slope", "slope_u", "slope2", "slope2_u"):
+                        values = dataset[group][name][:]
+                        error = np.abs(values - slopes) / slopes
+                        self.assertLess(error.max(), 1.e-6, f"{group}/{name}")
+
+    def test_write_river_scratch(self):
+        """Tests write and read back of node variables that share a scratch buffer."""
+
+        data = self.create_river_data()
+        node = data["node"]
+        node["slope_u"][:] = np.nan
+        node["slope_u"][0] = 0.5
+        node["dark_frac"][:] = 0.25
+        node["node_q_b"][:] = 7
+        node["node_q_b"][1, 2] = -999
+        with tempfile.TemporaryDirectory() as output_dir:
+            WriteRiver(self.REACH_ID, Path(output_dir), self.NODE_LIST).write(data, self.OBS_TIMES)
+            with Dataset(Path(output_dir) / f"{self.REACH_ID}_SWOT.nc") as dataset:
+                dataset.set_auto_mask(False)
+                variables = dataset["node"]
+                fill = variables["slope_u"]._FillValue
+                assert_array_equal([[0.5] * 4, [fill] * 4, [fill] * 4], variables["slope_u"][:])
+                assert_array_equal(np.full((3, 4), 0.25), variables["dark_frac"][:])
+                expected = np.full((3, 4), 7)
+                expected[1, 2] = WriteRiver.INT_FILL
+                assert_array_equal(expected, variables["node_q_b"][:])
+                expected = np.full((3, 4), 12)
+                expected[2, 2] = WriteRiver.INT_FILL
+                assert_array_equal(expected, variables["n_good_pix"][:])
+
+    def test_write_river_counts_and_flags(self):
+        """Tests write and read back of missing and out of range counts and flags."""
+
+        data = self.create_river_data()
+        data["reach"]["n_good_nod"][:] = [np.nan, -999, 300, 4]
+        data["reach"]["ice_clim_f"][:] = [np.nan, -999, 1, 0]
+        with tempfile.TemporaryDirectory() as output_dir:
+            WriteRiver(self.REACH_ID, Path(output_dir), self.NODE_LIST).write(data, self.OBS_TIMES)
+            with Dataset(Path(output_dir) / f"{self.REACH_ID}_SWOT.nc") as dataset:
+                reach = dataset["reach"]
+                self.assertEqual(np.uint8, reach["n_good_nod"].dtype)
+                self.assertEqual(WriteRiver.COUNT_FILL, reach["n_good_nod"]._FillValue)
+                self.assertEqual(np.int8, reach["ice_clim_f"].dtype)
+                self.assertEqual(WriteRiver.FLAG_FILL, reach["ice_clim_f"]._FillValue)
+
+                dataset.set_auto_mask(False)
+                assert_array_equal([255, 255, 255, 4], reach["n_good_nod"][:])
+                assert_array_equal([-1, -1, 1, 0], reach["ice_clim_f"][:])
+                dataset.set_auto_mask(True)
+                assert_array_equal([True, True, True, False], reach["n_good_nod"][:].mask)
+                assert_array_equal([True, True, False, False], reach["ice_clim_f"][:].mask)
+
+    def test_set_attributes(self):
+        """Tests set_attributes casts valid range attributes to the variable type."""
+
+        with Dataset("attributes.nc", "w", diskless=True) as dataset:
+            dataset.createDimension("nt", 2)
+            width = dataset.createVariable("width", "f4", ("nt",))
+            set_attributes(width, { "units": "m", "valid_min": 0, "valid_max": 100000 })
+            self.assertEqual("m", width.units)
+            self.assertEqual(np.float32, width.valid_min.dtype)
+            self.assertEqual(np.float32, width.valid_max.dtype)
+            self.assertEqual(0., width.valid_min)
+            self.assertEqual(100000., width.valid_max)
+
+            reach_q = dataset.createVariable("reach_q", "i1", ("nt",))
+            set_attributes(reach_q, { "valid_min": 0, "valid_max": 3 })
+            self.assertEqual(np.int8, reach_q.valid_min.dtype)
+            self.assertEqual(3, reach_q.valid_max)
+
+    def test_to_char_array(self):
+        """Tests to_char_array pads and truncates strings to width."""
+
+        strings = np.array([["2023-01-01T00:00:00Z", "no data"], 
+                            ["2023-01-02T00:00:00Z_extra", ""]], dtype=object)
+        chars = to_char_array(strings, 20)
+        self.assertEqual((2, 2, 20), chars.shape)
+        self.assertEqual(np.dtype("S1"), chars.dtype)
+        self.assertEqual(b"2023-01-01T00:00:00Z", chars[0, 0].tobytes())
+        self.assertEqual(b"no data" + b"\x00" * 13, chars[0, 1].tobytes())
+        self.assertEqual(b"2023-01-02T00:00:00Z", chars[1, 0].tobytes())
+        self.assertEqual(b"\x00" * 20, chars[1, 1].tobytes())
+
+        chars = to_char_array(np.array([b"abcdef", b"ab"]), 4)
+        assert_array_equal([[b"a", b"b", b"c", b"d"], [b"a", b"b", b"", b""]], chars)
+
+    def test_write_river(self):
+        """Tests write and read back of river data with missing values."""
+
+        data = self.create_river_data()
+        with tempfile.TemporaryDirectory() as output_dir:
+            writer = WriteRiver(self.REACH_ID, Path(output_dir), self.NODE_LIST)
+            writer.write(data, self.OBS_TIMES)
+            with Dataset(Path(output_dir) / f"{self.REACH_ID}_SWOT.nc") as dataset:
+                dataset.set_auto_mask(False)
+                node = dataset["node"]
+                reach = dataset["reach"]
+
+                # Empty node variables are skipped and read back as fill
+                for name in ("wse", "slope", "slope2_u"):
+                    assert_array_equal(np.full((3, 4), node[name]._FillValue), node[name][:])
+                assert_array_equal(np.full((3, 4), WriteRiver.FLAG_FILL), node["ice_dyn_f"][:])
+                assert_array_equal(np.full((3, 4), WriteRiver.INT_FILL), node["node_q_b"][:])
+
+                # Sentinel and NaN values read back as fill
+                expected = np.arange(12).reshape(3, 4) + 7.e8
+                expected[0, 0] = WriteRiver.FLOAT_FILL
+                assert_array_equal(expected, node["time"][:])
+                self.assertEqual(WriteRiver.FLOAT_FILL, node["d_x_area"][1, 1])
+                self.assertEqual(node["width"]._FillValue, node["width"][2, 3])
+                self.assertEqual(WriteRiver.INT_FILL, node["n_good_pix"][2, 2])
+                self.assertEqual(WriteRiver.FLAG_FILL, node["node_q"][0, 1])
+                assert_array_almost_equal(np.full(11, 80.5), np.delete(node["width"][:], 11))
+                self.assertEqual(b"2023-01-04T00:00:00Z", node["time_str"][2, 3].tobytes())
+                assert_array_equal(np.array(self.NODE_LIST, dtype=np.int64), node["node_id"][:])
+
+                assert_array_equal([WriteRiver.FLOAT_FILL, 1.5, 1.5, 1.5], reach["time"][:])
+                assert_array_equal([1.5, WriteRiver.FLOAT_FILL, 1.5, 1.5], reach["d_x_area"][:])
+                assert_array_equal([1.5, 1.5, reach["width"]._FillValue, 1.5], reach["width"][:])
+                assert_array_equal([2, 2, 2, WriteRiver.FLAG_FILL], reach["reach_q"][:])
+                assert_array_equal([WriteRiver.COUNT_FILL, 3, 3, 3], reach["n_good_nod"][:])
+
+                # Masked reads treat every fill value as missing
+                dataset.set_auto_mask(True)
+                self.assertTrue(node["wse"][:].mask.all())
+                self.assertTrue(node["time"][:].mask[0, 0])
+                self.assertTrue(reach["n_good_nod"][:].mask[0])
+                self.assertEqual(11, node["width"][:].count())
+
+if __name__ == "__main__":
+    unittest.main()